@@ -0,0 +1,130 @@
+"""
+Benchmark + corpus de acurácia do parser do chat (src/chat_parser.py).
+
+Uso:
+    python scripts/bench_chat_parser.py [--n 20000]
+
+Mede mensagens/s do parser compilado contra a cascata antiga (regex + varreduras
++ difflib) e confere estado/mês resolvidos em um corpus rotulado. Sai com código 1
+se algum caso do corpus falhar.
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+from difflib import get_close_matches
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from chat_parser import STATE_FULL, NAME_TO_SIGLA, ALIAS_MAP, parse_message  # noqa: E402
+
+# (mensagem, sigla esperada, mês esperado)
+CORPUS = [
+    ("Qual o risco no MT 2025-06?", "MT", ("single", "2025-06")),
+    ("Mostre previsão para Pará 2025-12", "PA", ("single", "2025-12")),
+    ("previsão para 2025-03", None, ("single", "2025-03")),
+    ("Top 5 estados para 2025-06", None, ("single", "2025-06")),
+    ("Top 3 estados próximos 2 meses", None, ("range", 2)),
+    ("top 3 estados proximos 4 meses", None, ("range", 4)),
+    ("risco em goias junho de 2025", "GO", ("single", "2025-06")),
+    ("Goiás em jun 2025", "GO", ("single", "2025-06")),
+    ("Mato Grosso do Sul 06/2025", "MS", ("single", "2025-06")),
+    ("mato grosso 2024/7", "MT", ("single", "2024-07")),
+    ("sao paulo próximo mês", "SP", ("next", 1)),
+    ("São Paulo proximo mes", "SP", ("next", 1)),
+    ("Paraná em março 2024", "PR", ("single", "2024-03")),
+    ("parana em marco 2024", "PR", ("single", "2024-03")),
+    ("paraíba dezembro 2025", "PB", ("single", "2025-12")),
+    ("Paraiba", "PB", None),
+    ("piaui", "PI", None),
+    ("rondonia set 2025", "RO", ("single", "2025-09")),
+    ("Rio Grande do Sul", "RS", None),
+    ("rio grande do norte 2025-01", "RN", ("single", "2025-01")),
+    ("Rio de Janeiro", "RJ", None),
+    ("espirito santo", "ES", None),
+    ("distrito federal 2025-02", "DF", ("single", "2025-02")),
+    ("brasilia", "DF", None),
+    ("Tocantins 2025-08", "TO", ("single", "2025-08")),
+    ("TO 2025-08", "TO", ("single", "2025-08")),
+    ("risco no mt", "MT", None),
+    ("previsão rs próximo mês", "RS", ("next", 1)),
+    ("pernanbuco", "PE", None),
+    ("maranhao out 2025", "MA", ("single", "2025-10")),
+    ("amapa", "AP", None),
+    ("ceará 2025-10", "CE", ("single", "2025-10")),
+    # falsos positivos da versão antiga
+    ("vou to the beach amanhã", None, None),
+    ("se chover o risco cai?", None, None),
+    ("para", None, None),
+    ("Para", None, None),
+    ("quanto para o próximo mês", None, ("next", 1)),
+    ("ajuda", None, None),
+    ("quais estados tiveram crescimento", None, None),
+    ("o que posso perguntar", None, None),
+]
+
+
+def legacy_parse(text):
+    """Cascata original do dashboard (antes do parser compilado), só para comparação."""
+    txt = (text or "").lower()
+    state = None
+    mo = re.search(r'\b([A-Za-z]{2})\b', txt)
+    if mo and mo.group(1).upper() in STATE_FULL:
+        state = mo.group(1).upper()
+    if state is None:
+        for name, sig in NAME_TO_SIGLA.items():
+            if name in txt:
+                state = sig
+                break
+    if state is None:
+        for alias, sig in ALIAS_MAP.items():
+            if alias in txt:
+                state = sig
+                break
+    if state is None:
+        matches = get_close_matches(txt, list(NAME_TO_SIGLA.keys()), n=1, cutoff=0.8)
+        if matches:
+            state = NAME_TO_SIGLA[matches[0]]
+    re.search(r'(\d{4})[-/](\d{1,2})', txt)
+    re.search(r'(jan(?:eiro)?|fev(?:ereiro)?|mar(?:ço|co)?|abr(?:il)?|mai(?:o)?|jun(?:ho)?|jul(?:ho)?|ago(?:sto)?|set(?:embro)?|out(?:ubro)?|nov(?:embro)?|dez(?:embro)?)\s+(\d{4})', txt)
+    re.search(r'pr[oó]ximos?\s+(\d+)\s+mes', txt) or re.search(r'next\s+(\d+)\s+month', txt)
+    re.search(r'\b(ajuda|como usar|o que posso perguntar|exemplos)\b', txt)
+    re.search(r'top\s+(\d+)', txt)
+    return state
+
+
+def check_corpus():
+    failures = 0
+    for msg, exp_state, exp_month in CORPUS:
+        parsed = parse_message(msg)
+        if parsed["state"] != exp_state or parsed["month"] != exp_month:
+            failures += 1
+            print(f"  ❌ {msg!r}: state={parsed['state']} month={parsed['month']} "
+                  f"(esperado {exp_state} {exp_month})")
+    legacy_ok = sum(legacy_parse(msg) == exp_state for msg, exp_state, _ in CORPUS)
+    print(f"🎯 Acurácia (estado+mês): {len(CORPUS)-failures}/{len(CORPUS)} | "
+          f"estado na versão antiga: {legacy_ok}/{len(CORPUS)}")
+    return failures
+
+
+def bench(fn, n):
+    msgs = [m for m, _, _ in CORPUS]
+    start = time.perf_counter()
+    for i in range(n):
+        fn(msgs[i % len(msgs)])
+    elapsed = time.perf_counter() - start
+    return n / elapsed
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=20000, help="mensagens por medição")
+    args = ap.parse_args()
+
+    failures = check_corpus()
+    new_rate = bench(parse_message, args.n)
+    old_rate = bench(legacy_parse, args.n)
+    print(f"⚡ parse_message: {new_rate:,.0f} msg/s | cascata antiga: {old_rate:,.0f} msg/s "
+          f"({new_rate/old_rate:.1f}x)")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,136 @@
+"""
+Benchmark do classificador temático compilado (src/theme_matcher.py).
+
+Uso:
+    python scripts/bench_theme_classifier.py [--keywords 5000] [--texts 5000]
+
+Gera um dicionário sintético com milhares de palavras-chave (mais as reais de
+nlp_pipeline.THEME_KEYWORDS) e manchetes sintéticas, e compara:
+- loop antigo (`kw in t` para cada palavra-chave de cada tema)
+- ThemeMatcher.classify (um texto por vez)
+- ThemeMatcher.classify_series (coluna pandas inteira)
+Também reporta a concordância dos temas com o loop antigo e confere as contagens
+por tema em casos com palavras-chave sobrepostas; sai com código 1 se alguma divergir.
+"""
+
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from chat_parser import strip_accents  # noqa: E402
+from theme_matcher import ThemeMatcher  # noqa: E402
+
+BASE_THEMES = {
+    "desmatamento": ["desmat", "desmatar", "desflorestamento"],
+    "denuncia": ["denúncia", "denuncia", "alerta", "cidadao", "denunciar"],
+    "controle": ["controle", "bombeiro", "combate", "contido", "contenção"],
+    "clima": ["seca", "chuva", "temperatura", "meteorologia", "previsão", "precipitação"],
+    "agronegocio": ["agronegócio", "queima controlada", "limpeza"]
+}
+FILLER = ("incêndio atinge área de preservação no estado após semanas sem chuva "
+          "bombeiros tentam conter fogo que avança sobre fazendas e reserva indígena").split()
+
+
+def make_keywords(n, rng):
+    themes = {t: list(kws) for t, kws in BASE_THEMES.items()}
+    names = list(themes)
+    for i in range(n):
+        word = "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(5, 12)))
+        themes[names[i % len(names)]].append(word)
+    return themes
+
+
+def make_texts(n, themes, rng):
+    pool = [kw for kws in themes.values() for kw in kws]
+    texts = []
+    for _ in range(n):
+        words = rng.sample(FILLER, 10) + rng.sample(pool, rng.randint(0, 3))
+        rng.shuffle(words)
+        texts.append(" ".join(words))
+    return texts
+
+
+# (temas, texto): palavras-chave que começam dentro de um match anterior
+OVERLAP_CASES = [
+    ({"a": ["seca"], "b": ["cabra"]}, "secabra"),
+    ({"x": ["ab", "abc"], "y": ["bcd", "bcde"]}, "abcde"),
+    ({"x": ["desmat"], "y": ["matar", "tar"]}, "vão desmatar"),
+    ({"clima": ["chuva"], "outro": ["uva"]}, "chuvas e uvas"),
+]
+
+
+def legacy_counts(text, themes):
+    """Contagem por tema do loop original de nlp_pipeline.classify_text (themes sem acento)."""
+    t = strip_accents(text)
+    counts = {}
+    for theme, kws in themes.items():
+        for kw in kws:
+            if kw in t:
+                counts[theme] = counts.get(theme, 0) + 1
+    return counts
+
+
+def legacy_classify(text, themes):
+    """Loop original de nlp_pipeline.classify_text (themes já sem acento, ver normalize_themes)."""
+    counts = legacy_counts(text, themes)
+    if counts:
+        return max(counts.items(), key=lambda x: x[1])[0]
+    return "outros"
+
+
+def normalize_themes(themes):
+    return {t: sorted(set(strip_accents(k) for k in kws)) for t, kws in themes.items()}
+
+
+def check_overlaps():
+    failures = 0
+    for themes, text in OVERLAP_CASES:
+        matcher = ThemeMatcher(themes)
+        expected = legacy_counts(text, normalize_themes(themes))
+        frame = matcher.count_frame(pd.Series([text])).iloc[0]
+        got_frame = {t: int(c) for t, c in frame.items() if c}
+        if matcher.counts(text) != expected or got_frame != expected:
+            failures += 1
+            print(f"  ❌ {text!r}: counts={matcher.counts(text)} count_frame={got_frame} (esperado {expected})")
+    print(f"🧩 sobreposições: {len(OVERLAP_CASES)-failures}/{len(OVERLAP_CASES)} casos com contagem igual ao loop antigo")
+    return failures
+
+
+def timed(fn):
+    start = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--keywords", type=int, default=5000, help="palavras-chave sintéticas")
+    ap.add_argument("--texts", type=int, default=5000, help="manchetes sintéticas")
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    themes = make_keywords(args.keywords, rng)
+    texts = make_texts(args.texts, themes, rng)
+    n_kw = sum(len(v) for v in themes.values())
+
+    matcher, t_build = timed(lambda: ThemeMatcher(themes))
+    themes_n = normalize_themes(themes)
+    legacy, t_legacy = timed(lambda: [legacy_classify(t, themes_n) for t in texts])
+    scalar, t_scalar = timed(lambda: [matcher.classify(t) for t in texts])
+    vector, t_vector = timed(lambda: matcher.classify_series(pd.Series(texts)).tolist())
+
+    print(f"📚 {n_kw:,} palavras-chave | {len(texts):,} textos | compilação: {t_build:.2f}s")
+    for name, secs in [("loop antigo", t_legacy), ("classify", t_scalar), ("classify_series", t_vector)]:
+        print(f"⚡ {name:16s} {len(texts)/secs:12,.0f} textos/s ({t_legacy/secs:6.1f}x)")
+    agree_scalar = sum(a == b for a, b in zip(legacy, scalar)) / len(texts)
+    agree_vector = sum(a == b for a, b in zip(scalar, vector)) / len(texts)
+    print(f"🎯 concordância com loop antigo: {agree_scalar:.2%} | classify vs classify_series: {agree_vector:.2%}")
+    failures = check_overlaps()
+    sys.exit(1 if failures or agree_vector < 1 else 0)
@@ -0,0 +1,114 @@
+"""
+Verificação do coletor RSS (src/rss_collector.py) contra um feed local.
+
+Uso:
+    python scripts/check_rss_collector.py
+
+Serve scripts/fixtures/feed.xml em http://127.0.0.1 com ETag e roda o coletor em
+um diretório temporário (data/raw/ próprio), conferindo:
+1. a 1ª execução acrescenta as manchetes sobre o tema;
+2. a 2ª execução recebe 304 (If-None-Match) e não acrescenta nada;
+3. sem o ETag salvo (resposta 200), manchetes já vistas não são duplicadas;
+4. com o feed atualizado (feed_atualizado.xml), só as manchetes novas entram.
+Sai com código 1 se alguma verificação falhar.
+"""
+
+import hashlib
+import os
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+import rss_collector  # noqa: E402
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+class FeedHandler(BaseHTTPRequestHandler):
+    """Serve o feed atual do servidor com ETag; responde 304 se o If-None-Match bater."""
+
+    def do_GET(self):
+        body = self.server.feed
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        self.server.statuses.append(304 if self.headers.get("If-None-Match") == etag else 200)
+        if self.server.statuses[-1] == 304:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml; charset=utf-8")
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), "rb") as f:
+        return f.read()
+
+
+def texts_rows():
+    if not os.path.exists(rss_collector.RAW_TEXTS_PATH):
+        return []
+    return pd.read_csv(rss_collector.RAW_TEXTS_PATH, encoding="utf-8")["text"].tolist()
+
+
+def run_checks(url, server):
+    failures = 0
+
+    def check(ok, msg):
+        nonlocal failures
+        failures += not ok
+        print(f"  {'✅' if ok else '❌'} {msg}")
+
+    rss_collector.collect_new_texts([url])
+    first = texts_rows()
+    check(server.statuses[-1] == 200 and len(first) == 3,
+          f"1ª execução: HTTP {server.statuses[-1]}, {len(first)} manchetes (esperado 200, 3)")
+
+    new = rss_collector.collect_new_texts([url])
+    check(server.statuses[-1] == 304 and new.empty and texts_rows() == first,
+          f"2ª execução: HTTP {server.statuses[-1]}, {len(new)} novas (esperado 304, 0)")
+
+    os.remove(rss_collector.RSS_STATE_PATH)
+    new = rss_collector.collect_new_texts([url])
+    check(server.statuses[-1] == 200 and new.empty and texts_rows() == first,
+          f"sem ETag salvo: HTTP {server.statuses[-1]}, {len(new)} novas (esperado 200, 0 duplicadas)")
+
+    server.feed = read_fixture("feed_atualizado.xml")
+    new = rss_collector.collect_new_texts([url])
+    rows = texts_rows()
+    expected = first + ["Fumaça de queimadas chega a São Paulo", "Incêndio florestal avança no Tocantins"]
+    check(server.statuses[-1] == 200 and rows == expected,
+          f"feed atualizado: HTTP {server.statuses[-1]}, {len(new)} novas, {len(rows)} no total (esperado 200, 2, 5)")
+    ids = pd.read_csv(rss_collector.RAW_TEXTS_PATH, encoding="utf-8")["id"].tolist()
+    check(ids == list(range(len(ids))), f"ids contínuos entre execuções: {ids}")
+    return failures
+
+
+if __name__ == "__main__":
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FeedHandler)
+    server.feed, server.statuses = read_fixture("feed.xml"), []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/feed.xml"
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            print(f"🧪 Coletor RSS contra {url} (em {tmp})")
+            failures = run_checks(url, server)
+        finally:
+            os.chdir(cwd)
+            server.shutdown()
+    print(f"🏁 {'todas as verificações passaram' if not failures else f'{failures} verificação(ões) falharam'}")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,175 @@
+"""
+Parser de mensagens do chat do dashboard.
+
+Um único regex compilado (construído uma vez na importação) reconhece, em uma
+só passada sobre a mensagem:
+- estados: nomes completos, aliases e siglas (nomes sem sensibilidade a acentos)
+- meses: yyyy-mm, mm/yyyy, "junho de 2025", "próximo mês", "próximos N meses"
+- intenções: ajuda, top N, estados, crescimento
+"""
+
+import re
+import unicodedata
+from difflib import get_close_matches
+
+# small mapping state name <-> UF (cleaner, priority: canonical full name mapping)
+STATE_FULL = {
+    "AC":"Acre","AL":"Alagoas","AP":"Amapá","AM":"Amazonas","BA":"Bahia","CE":"Ceará",
+    "DF":"Distrito Federal","ES":"Espírito Santo","GO":"Goiás","MA":"Maranhão","MT":"Mato Grosso",
+    "MS":"Mato Grosso do Sul","MG":"Minas Gerais","PA":"Pará","PB":"Paraíba","PR":"Paraná",
+    "PE":"Pernambuco","PI":"Piauí","RJ":"Rio de Janeiro","RN":"Rio Grande do Norte","RS":"Rio Grande do Sul",
+    "RO":"Rondônia","RR":"Roraima","SC":"Santa Catarina","SP":"São Paulo","SE":"Sergipe","TO":"Tocantins"
+}
+# lowercase name -> sigla
+NAME_TO_SIGLA = {v.lower():k for k,v in STATE_FULL.items()}
+# create aliases for common spellings/without accents
+ALIAS_MAP = {
+    "amapa":"AP","amapá":"AP","paraiba":"PB","paraíba":"PB","piaui":"PI","piauí":"PI",
+    "sao paulo":"SP","são paulo":"SP","ceara":"CE","ceará":"CE","espirito santo":"ES","espírito santo":"ES",
+    "mato grosso":"MT","mato grosso do sul":"MS","rondonia":"RO","rondônia":"RO","maranhao":"MA","maranhão":"MA",
+    "brasilia":"DF","brasília":"DF"
+}
+
+# names whose unaccented spelling is an ordinary Portuguese word ("para") only match with the accent
+ACCENT_REQUIRED = {"pará"}
+# siglas that are also common words/syllables ("to", "se", "pe", "ma"...) only match in upper case
+AMBIGUOUS_SIGLAS = {"AC","AL","AM","AP","BA","CE","ES","GO","MA","PA","PE","PI","RO","SE","TO"}
+
+MONTHS_MAP = {"jan":1,"fev":2,"mar":3,"abr":4,"mai":5,"jun":6,"jul":7,"ago":8,"set":9,"out":10,"nov":11,"dez":12}
+MONTH_NAMES = r'jan(?:eiro)?|fev(?:ereiro)?|mar(?:ço|co)?|abr(?:il)?|mai(?:o)?|jun(?:ho)?|jul(?:ho)?|ago(?:sto)?|set(?:embro)?|out(?:ubro)?|nov(?:embro)?|dez(?:embro)?'
+
+_ACCENT_CLASSES = {"a": "[aáàâã]", "e": "[eéê]", "i": "[ií]", "o": "[oóôõ]", "u": "[uúü]", "c": "[cç]"}
+
+
+def strip_accents(text):
+    """Remove acentos (NFKD) e coloca em minúsculas: 'São Paulo' -> 'sao paulo'."""
+    nfkd = unicodedata.normalize("NFKD", text or "")
+    return "".join(ch for ch in nfkd if not unicodedata.combining(ch)).lower()
+
+
+def _accent_insensitive(name):
+    """'goiás' -> 'g[oóôõ][ií][aáàâã]s' (espaços viram \\s+)."""
+    parts = []
+    for ch in strip_accents(name):
+        if ch == " ":
+            parts.append(r"\s+")
+        else:
+            parts.append(_ACCENT_CLASSES.get(ch, re.escape(ch)))
+    return "".join(parts)
+
+
+def _build_state_index():
+    """Junta nomes e aliases em [(sigla, regex)], do mais longo ao mais curto."""
+    names = {}
+    for name, sig in list(NAME_TO_SIGLA.items()) + list(ALIAS_MAP.items()):
+        if name in ACCENT_REQUIRED:
+            names[name] = (sig, re.escape(name))
+        else:
+            names.setdefault(strip_accents(name), (sig, _accent_insensitive(name)))
+    # longest first so "mato grosso do sul" wins over "mato grosso"
+    return sorted(names.values(), key=lambda x: len(x[1]), reverse=True)
+
+
+# one named group per state form; the group name maps back to the sigla
+_STATE_GROUPS = {f"uf{i}": sig for i, (sig, _) in enumerate(_build_state_index())}
+# ACCENT_REQUIRED names are left out: their unaccented key ("para") is an ordinary word,
+# and a message that is exactly that word skips the fallback (else "para" ~ "parana")
+_FUZZY_NAMES = {strip_accents(n): s for n, s in list(NAME_TO_SIGLA.items()) + list(ALIAS_MAP.items())
+                if n not in ACCENT_REQUIRED}
+_FUZZY_SKIP = {strip_accents(n) for n in ACCENT_REQUIRED}
+
+
+def _build_pattern():
+    name_alts = "|".join(f"(?P<uf{i}>{pat})" for i, (_, pat) in enumerate(_build_state_index()))
+    strict = "|".join(sorted(s for s in STATE_FULL if s in AMBIGUOUS_SIGLAS))
+    loose = "|".join(sorted(s for s in STATE_FULL if s not in AMBIGUOUS_SIGLAS))
+    # every alternative starts at a word boundary; factoring \b out lets the engine
+    # reject mid-word positions with a single check instead of trying each branch
+    pattern = r"\b(?:" + "|".join([
+        r"(?P<ym>(?P<ym_y>\d{4})[-/](?P<ym_m>\d{1,2})\b)",
+        r"(?P<my>(?P<my_m>\d{1,2})/(?P<my_y>\d{4})\b)",
+        rf"(?i:(?P<mname>(?P<mname_m>{MONTH_NAMES})(?:\s+de)?\s+(?P<mname_y>\d{{4}})\b))",
+        r"(?i:(?P<nextn>(?:pr[oó]ximos?\s+(?P<nextn_n>\d+)\s+mes|next\s+(?P<nextn_m>\d+)\s+month)))",
+        r"(?i:(?P<next1>pr[oó]ximo\s+m[eê]s\b))",
+        r"(?i:(?P<help>(?:ajuda|como\s+usar|o\s+que\s+posso\s+perguntar|exemplos)\b))",
+        r"(?i:(?P<top>top\b(?:\s+(?P<top_n>\d+))?))",
+        r"(?i:(?P<growth>cresc\w*|maior\s+aumento))",
+        r"(?i:(?P<estado>estados?\b))",
+        rf"(?i:(?:{name_alts})\b)",
+        rf"(?P<sigla>(?:{strict})\b|(?i:{loose})\b)",
+    ]) + ")"
+    return re.compile(pattern)
+
+
+CHAT_PATTERN = _build_pattern()
+
+
+def parse_message(msg):
+    """
+    Analisa a mensagem em uma passada. Retorna dict com:
+    state (sigla ou None), month (('single', 'yyyy-mm'), ('next', 1), ('range', n) ou None),
+    top_n (int ou None) e intents (set com 'help', 'top', 'estado', 'growth').
+    """
+    text = unicodedata.normalize("NFC", msg or "")
+    state = None
+    month = None
+    top_n = None
+    intents = set()
+    for mo in CHAT_PATTERN.finditer(text):
+        # lastgroup is the outermost group of the alternative that matched
+        kind = mo.lastgroup
+        if kind in ("ym", "my"):
+            y, m = int(mo.group(f"{kind}_y")), int(mo.group(f"{kind}_m"))
+            if month is None and 1 <= m <= 12:
+                month = ("single", f"{y}-{m:02d}")
+        elif kind == "mname":
+            if month is None:
+                m = MONTHS_MAP[mo.group("mname_m")[:3].lower()]
+                month = ("single", f"{int(mo.group('mname_y'))}-{m:02d}")
+        elif kind == "nextn":
+            if month is None:
+                month = ("range", int(mo.group("nextn_n") or mo.group("nextn_m")))
+        elif kind == "next1":
+            if month is None:
+                month = ("next", 1)
+        elif kind == "top":
+            intents.add("top")
+            if top_n is None and mo.group("top_n"):
+                top_n = int(mo.group("top_n"))
+        elif kind in ("help", "growth", "estado"):
+            intents.add(kind)
+        elif kind == "sigla":
+            if state is None:
+                state = mo.group("sigla").upper()
+        elif state is None:
+            state = _STATE_GROUPS[kind]
+    if state is None and month is None and not intents and len(text) <= 25:
+        # typo fallback for bare state names only ("pernanbuco", "santa catarna")
+        key = strip_accents(text).strip()
+        matches = [] if key in _FUZZY_SKIP else get_close_matches(key, _FUZZY_NAMES, n=1, cutoff=0.8)
+        if matches:
+            state = _FUZZY_NAMES[matches[0]]
+    return {"state": state, "month": month, "top_n": top_n, "intents": intents}
+
+
+def shift_month(ano_mes, n):
+    """'2025-11' + 2 -> '2026-01'."""
+    y0, m0 = map(int, ano_mes.split("-"))
+    mm = m0 + n
+    yy = y0 + (mm-1)//12
+    mm = ((mm-1)%12)+1
+    return f"{yy}-{mm:02d}"
+
+
+def resolve_month(month, preds_local):
+    """Converte o 'month' de parse_message em (tipo, valor) usando o último mês de preds."""
+    if month is None:
+        return None, None
+    if month[0] == "single":
+        return month
+    if preds_local is None:
+        return None, None
+    last = sorted(preds_local["ano_mes"].unique())[-1]
+    if month[0] == "next":
+        return "single", shift_month(last, 1)
+    return "range", [shift_month(last, i) for i in range(1, month[1]+1)]
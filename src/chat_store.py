@@ -0,0 +1,164 @@
+"""
+Histórico do chat em SQLite (substitui o append em chat_history.csv).
+
+- Banco embutido em modo WAL: leituras (analytics) não bloqueiam a escrita
+- Uma thread de escrita em segundo plano consome uma fila e grava em lotes
+  (um commit por lote em vez de um open/append por mensagem)
+- Índices por timestamp e por intenção detectada, para consultas como
+  "estados mais perguntados" sem varrer o log inteiro
+"""
+
+import atexit
+import os
+import queue
+import sqlite3
+import threading
+from datetime import datetime
+
+from chat_parser import parse_message
+
+CHAT_DB_PATH = "data/processed/chat_history.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS chat_messages (
+    id       INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts       TEXT NOT NULL,
+    session  TEXT,
+    who      TEXT NOT NULL,
+    msg      TEXT NOT NULL,
+    intent   TEXT,
+    estado   TEXT,
+    ano_mes  TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_chat_ts ON chat_messages(ts);
+CREATE INDEX IF NOT EXISTS idx_chat_intent ON chat_messages(intent, estado, ano_mes, ts);
+"""
+
+_STOP = object()
+
+
+def intent_from_parsed(parsed):
+    """Resume o resultado de parse_message em (intent, estado, ano_mes)."""
+    intents = parsed["intents"]
+    if "help" in intents:
+        intent = "ajuda"
+    elif "top" in intents and "estado" in intents:
+        intent = "top_estados"
+    elif parsed["state"]:
+        intent = "estado"
+    elif "growth" in intents:
+        intent = "crescimento"
+    else:
+        intent = "outros"
+    month = parsed["month"]
+    ano_mes = month[1] if month and month[0] == "single" else None
+    return intent, parsed["state"], ano_mes
+
+
+def detect_intent(msg):
+    """(intent, estado, ano_mes) de uma mensagem ainda não parseada."""
+    return intent_from_parsed(parse_message(msg))
+
+
+class ChatStore:
+    """Fila + thread de escrita em lote sobre um banco SQLite em WAL."""
+
+    def __init__(self, path=CHAT_DB_PATH, batch_size=100, flush_interval=1.0):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as con:
+            con.executescript(SCHEMA)
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._writer, name="chat-store-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _connect(self):
+        con = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        con.execute("PRAGMA journal_mode=WAL")
+        con.execute("PRAGMA synchronous=NORMAL")
+        return con
+
+    def append(self, history, session=None, parsed=None):
+        """
+        Enfileira [(who, msg), ...]; não bloqueia a requisição do dashboard.
+        `parsed`: parse_message da mensagem do usuário, se quem chama já o tem (evita parsear de novo).
+        """
+        ts = datetime.now().isoformat()
+        for who, msg in history:
+            if who == "Você":
+                intent, estado, ano_mes = intent_from_parsed(parsed) if parsed else detect_intent(msg)
+            else:
+                intent, estado, ano_mes = None, None, None
+            self._queue.put((ts, session, who, msg, intent, estado, ano_mes))
+
+    def _writer(self):
+        con = self._connect()
+        done = False
+        while not done:
+            batch = []
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            while item is not _STOP:
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            done = item is _STOP
+            if batch:
+                try:
+                    with con:
+                        con.executemany(
+                            "INSERT INTO chat_messages (ts, session, who, msg, intent, estado, ano_mes) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?)", batch)
+                except sqlite3.Error as e:
+                    print(f"⚠️ Erro ao gravar histórico do chat ({len(batch)} mensagens): {e}")
+            for _ in range(len(batch) + (1 if done else 0)):
+                self._queue.task_done()
+        con.close()
+
+    def flush(self):
+        """Espera a fila esvaziar (todas as mensagens enfileiradas gravadas)."""
+        self._queue.join()
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout=5)
+
+    # --- analytics (usam os índices; não varrem o log inteiro) ---
+    def _query(self, sql, params=()):
+        con = self._connect()
+        try:
+            return con.execute(sql, params).fetchall()
+        finally:
+            con.close()
+
+    def top_states(self, n=10, since=None):
+        """Estados mais perguntados: [(estado, contagem), ...]."""
+        return self._query(
+            "SELECT estado, COUNT(*) AS c FROM chat_messages "
+            "WHERE intent = 'estado' AND ts >= ? GROUP BY estado ORDER BY c DESC LIMIT ?",
+            (since or "", n))
+
+    def top_months(self, n=10, since=None):
+        """Meses (ano_mes) mais perguntados: [(ano_mes, contagem), ...]."""
+        return self._query(
+            "SELECT ano_mes, COUNT(*) AS c FROM chat_messages "
+            "WHERE intent IN ('estado', 'top_estados') AND ano_mes IS NOT NULL AND ts >= ? "
+            "GROUP BY ano_mes ORDER BY c DESC LIMIT ?",
+            (since or "", n))
+
+    def intent_counts(self, since=None):
+        """Contagem de mensagens por intenção: [(intent, contagem), ...]."""
+        return self._query(
+            "SELECT intent, COUNT(*) AS c FROM chat_messages "
+            "WHERE intent IS NOT NULL AND ts >= ? GROUP BY intent ORDER BY c DESC",
+            (since or "",))
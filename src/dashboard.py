@@ -7,18 +7,20 @@ import numpy as np
 import joblib
 import os
 import matplotlib.pyplot as plt
-import re
-from datetime import datetime
 from dateutil import parser as dateparser  # pip install python-dateutil
-from difflib import get_close_matches
 
 DATA_FEAT = "data/processed/features_state_month.parquet"
 PRED_CSV = "data/processed/predictions.csv"
 NLP_KW = "data/processed/nlp_keywords.csv"
 MODEL_PATH = "data/models/rf_model.joblib"
 
+# timings/memory of each stage -> data/processed/profile.jsonl (streamlit run src/dashboard.py -- --profile)
+from profiling import traced, enable_from_argv, read_spans
+enable_from_argv()
+
 # Load data FIRST so helpers can reference them safely
 @st.cache_data
+@traced("dashboard.load_data", rows=lambda r: None if r[0] is None else len(r[0]))
 def load_data():
     df = None
     preds = None
@@ -36,87 +38,8 @@ df, preds, kw, model = load_data()
 # -------------------------
 # Helpers for improved chat
 # -------------------------
-# small mapping state name <-> UF (cleaner, priority: canonical full name mapping)
-STATE_FULL = {
-    "AC":"Acre","AL":"Alagoas","AP":"Amapá","AM":"Amazonas","BA":"Bahia","CE":"Ceará",
-    "DF":"Distrito Federal","ES":"Espírito Santo","GO":"Goiás","MA":"Maranhão","MT":"Mato Grosso",
-    "MS":"Mato Grosso do Sul","MG":"Minas Gerais","PA":"Pará","PB":"Paraíba","PR":"Paraná",
-    "PE":"Pernambuco","PI":"Piauí","RJ":"Rio de Janeiro","RN":"Rio Grande do Norte","RS":"Rio Grande do Sul",
-    "RO":"Rondônia","RR":"Roraima","SC":"Santa Catarina","SP":"São Paulo","SE":"Sergipe","TO":"Tocantins"
-}
-# lowercase name -> sigla
-NAME_TO_SIGLA = {v.lower():k for k,v in STATE_FULL.items()}
-# create aliases for common spellings/without accents
-ALIAS_MAP = {
-    "amapa":"AP","amapá":"AP","paraiba":"PB","paraíba":"PB","piaui":"PI","piauí":"PI",
-    "sao paulo":"SP","são paulo":"SP","ceara":"CE","ceará":"CE","espirito santo":"ES","espírito santo":"ES",
-    "mato grosso":"MT","mato grosso do sul":"MS","rondonia":"RO","rondônia":"RO","maranhao":"MA","maranhão":"MA"
-}
-# combined lookup
-def normalize_state(text):
-    txt = (text or "").lower()
-    # check for sigla pattern
-    mo = re.search(r'\b([A-Za-z]{2})\b', txt)
-    if mo:
-        cand = mo.group(1).upper()
-        if cand in STATE_FULL:
-            return cand
-    # direct name match (full names)
-    for name, sig in NAME_TO_SIGLA.items():
-        if name in txt:
-            return sig
-    # alias map
-    for alias, sig in ALIAS_MAP.items():
-        if alias in txt:
-            return sig
-    # fuzzy match against names
-    matches = get_close_matches(txt, list(NAME_TO_SIGLA.keys()), n=1, cutoff=0.8)
-    if matches:
-        return NAME_TO_SIGLA[matches[0]]
-    return None
-
-def parse_requested_month(msg, preds_local):
-    msg_l = (msg or "").lower()
-    # explicit yyyy-mm or yyyy/mm
-    mo = re.search(r'(\d{4})[-/](\d{1,2})', msg_l)
-    if mo:
-        y = int(mo.group(1)); m = int(mo.group(2))
-        return "single", f"{y}-{m:02d}"
-    # month name + year
-    mo2 = re.search(r'(jan(?:eiro)?|fev(?:ereiro)?|mar(?:ço|co)?|abr(?:il)?|mai(?:o)?|jun(?:ho)?|jul(?:ho)?|ago(?:sto)?|set(?:embro)?|out(?:ubro)?|nov(?:embro)?|dez(?:embro)?)\s+(\d{4})', msg_l)
-    months_map = {"jan":1,"fev":2,"mar":3,"abr":4,"mai":5,"jun":6,"jul":7,"ago":8,"set":9,"out":10,"nov":11,"dez":12}
-    if mo2:
-        mon = mo2.group(1)[:3]
-        year = int(mo2.group(2))
-        m = months_map.get(mon, None)
-        if m:
-            return "single", f"{year}-{m:02d}"
-    # próximos N meses
-    mo3 = re.search(r'pr[oó]ximos?\s+(\d+)\s+mes', msg_l) or re.search(r'next\s+(\d+)\s+month', msg_l)
-    if mo3:
-        n = int(mo3.group(1))
-        if preds_local is None:
-            return None, None
-        last = sorted(preds_local["ano_mes"].unique())[-1]
-        y0, m0 = map(int, last.split("-"))
-        months = []
-        for i in range(1, n+1):
-            mm = m0 + i
-            yy = y0 + (mm-1)//12
-            mm = ((mm-1)%12)+1
-            months.append(f"{yy}-{mm:02d}")
-        return "range", months
-    # próximo mês
-    if "próximo mês" in msg_l or "proximo mes" in msg_l or "proximo mês" in msg_l:
-        if preds_local is None:
-            return None, None
-        last = sorted(preds_local["ano_mes"].unique())[-1]
-        y0, m0 = map(int, last.split("-"))
-        mm = m0 + 1
-        yy = y0 + (mm-1)//12
-        mm = ((mm-1)%12)+1
-        return "single", f"{yy}-{mm:02d}"
-    return None, None
+# state names, aliases and month expressions live in chat_parser (one compiled matcher)
+from chat_parser import STATE_FULL, parse_message, resolve_month
 
 def top_n_for_month(ano_mes, n=5):
     if preds is None:
@@ -150,24 +73,25 @@ def predict_for_state_month(state_sigla, ano_mes):
             estado_encoded = int(df[df["estado"]==state_full]["estado_encoded"].mode().iloc[0])
         else:
             estado_encoded = list(sorted(preds["estado"].unique())).index(state_full)
-        X = np.array([[estado_encoded, y, m, focos_val]])
+        feats = {"estado_encoded": estado_encoded, "ano": y, "mes": m, "focos": focos_val}
+        # models trained with news signals (news_* columns) get 0 for them, as in future months
+        cols = list(getattr(model, "feature_names_in_", feats))
+        X = pd.DataFrame([[feats.get(c, 0.0) for c in cols]], columns=cols)
         pred = model.predict(X)[0]
         return float(pred)
     except Exception:
         return None
 
-CHAT_HISTORY_PATH = "data/processed/chat_history.csv"
-def save_chat_history(history):
-    try:
-        import csv, os
-        os.makedirs(os.path.dirname(CHAT_HISTORY_PATH), exist_ok=True)
-        with open(CHAT_HISTORY_PATH, "a", encoding="utf-8", newline="") as f:
-            writer = csv.writer(f)
-            for who,msg in history:
-                writer.writerow([datetime.now().isoformat(), who, msg])
-    except Exception:
-        pass
-    
+# chat history goes to SQLite (WAL + background batch writer); one store per server process
+from chat_store import ChatStore
+
+@st.cache_resource
+def get_chat_store():
+    return ChatStore()
+
+def save_chat_history(history, parsed=None):
+    get_chat_store().append(history, parsed=parsed)
+
 st.set_page_config(layout="wide", page_title="Preditor de Risco de Queimadas")
 
 st.title("🔥 Preditor de Risco de Queimadas — Dashboard")
@@ -261,26 +185,27 @@ st.header("Chat (respostas rápidas)")
 if "chat_history" not in st.session_state:
     st.session_state.chat_history = []
 
-def chat_response(msg):
+@traced("dashboard.chat_response", rows=None)
+def chat_response(msg, parsed=None):
     if not msg or preds is None:
         return "Ainda não há dados de previsão carregados. Rode o pipeline e atualize."
 
-    msg_lower = msg.lower()
-    if re.search(r'\b(ajuda|como usar|o que posso perguntar|exemplos)\b', msg_lower):
+    parsed = parsed or parse_message(msg)
+    intents = parsed["intents"]
+    if "help" in intents:
         return ("Você pode perguntar por exemplo:\n"
                 "- 'Top 5 estados para 2025-06'\n"
                 "- 'Qual o risco no MT 2025-06?'\n"
                 "- 'Top 3 estados próximos 2 meses'\n"
                 "- 'Mostre previsão para Pará 2025-12'\n")
 
-    mo_topn = re.search(r'top\s+(\d+)', msg_lower)
-    top_n = int(mo_topn.group(1)) if mo_topn else 5
+    top_n = parsed["top_n"] or 5
 
-    month_type, month_val = parse_requested_month(msg, preds)
-    state_sigla = normalize_state(msg)
+    month_type, month_val = resolve_month(parsed["month"], preds)
+    state_sigla = parsed["state"]
 
     # Top states
-    if "top" in msg_lower and "estado" in msg_lower:
+    if "top" in intents and "estado" in intents:
         if month_type == "range":
             lines = []
             for am in month_val:
@@ -339,7 +264,7 @@ def chat_response(msg):
                 return "Sem dados para esse estado."
 
     # growth intent
-    if any(k in msg_lower for k in ["crescimento","maior aumento","cresc"]):
+    if "growth" in intents:
         months = sorted(preds["ano_mes"].unique())
         if len(months) < 2:
             return "Não há meses suficientes para calcular crescimento."
@@ -358,11 +283,13 @@ def chat_response(msg):
 user_input = st.text_input("Digite sua pergunta:", key="input")
 if st.button("Enviar"):
     if user_input:
-        resp = chat_response(user_input)
+        # parsed once: the answer and the history's intent columns share it
+        parsed = parse_message(user_input)
+        resp = chat_response(user_input, parsed)
         st.session_state.chat_history.append(("Você", user_input))
         st.session_state.chat_history.append(("Sistema", resp))
         # salvamos as duas últimas mensagens
-        save_chat_history(st.session_state.chat_history[-2:])
+        save_chat_history(st.session_state.chat_history[-2:], parsed=parsed)
 
 # show chat history
 for who, msg in st.session_state.chat_history[-10:]:
@@ -371,5 +298,40 @@ for who, msg in st.session_state.chat_history[-10:]:
     else:
         st.markdown(f"**Sistema:** {msg}")
 
+with st.expander("Perguntas mais frequentes (histórico do chat)"):
+    store = get_chat_store()
+    c1, c2 = st.columns(2)
+    c1.write("Estados mais perguntados")
+    c1.table(pd.DataFrame(store.top_states(10), columns=["estado", "perguntas"]))
+    c2.write("Meses mais perguntados")
+    c2.table(pd.DataFrame(store.top_months(10), columns=["ano_mes", "perguntas"]))
+
+st.markdown("---")
+# Profiling: latest time per call of each stage vs. the median of earlier runs
+with st.expander("⏱️ Desempenho do pipeline (profile.jsonl)"):
+    spans = read_spans()
+    if not spans:
+        st.info("Sem medições. Rode os scripts com `--profile` (ex.: `python src/data_processing.py --profile`).")
+    else:
+        prof = pd.DataFrame(spans)
+        prof["ts"] = pd.to_datetime(prof["ts"])
+        # per-call time for each stage and run: the dashboard's own run lasts the whole server
+        # process, so its totals grow with every rerun/question and can't be compared to a batch run
+        per_run = prof.groupby(["stage", "run"]).agg(
+            ts=("ts", "max"), wall_s=("wall_s", "sum"), rows=("rows", "sum"),
+            peak_mb=("peak_mb", "max"), calls=("wall_s", "size")).reset_index().sort_values("ts")
+        per_run["s_por_chamada"] = per_run["wall_s"] / per_run["calls"]
+        latest = per_run.groupby("stage").tail(1).set_index("stage")
+        earlier = per_run[~per_run.index.isin(per_run.groupby("stage").tail(1).index)]
+        latest["mediana_anterior_s"] = earlier.groupby("stage")["s_por_chamada"].median()
+        latest["variacao"] = latest["s_por_chamada"] / latest["mediana_anterior_s"]
+        st.dataframe(latest[["ts", "s_por_chamada", "mediana_anterior_s", "variacao", "calls", "wall_s",
+                             "rows", "peak_mb"]].sort_values("wall_s", ascending=False))
+        st.caption("peak_mb só é medido nos scripts em lote (thread principal); nos estágios do "
+                   "dashboard fica vazio, pois o pico do tracemalloc é global ao processo.")
+        slow = latest[latest["variacao"] > 1.5]
+        if not slow.empty:
+            st.warning("Estágios >50% mais lentos por chamada que a mediana: " + ", ".join(slow.index))
+
 st.markdown("---")
 st.caption("Observação: Chat é baseado em regras usando o arquivo de previsões (predictions.csv) — não é um modelo de linguagem grande.")
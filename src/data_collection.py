@@ -5,6 +5,8 @@ import zipfile
 import pandas as pd
 from io import BytesIO
 
+from profiling import traced, enable_from_argv
+
 # URL base do INPE (dados mensais Brasil)
 BASE_URL = "https://dataserver-coids.inpe.br/queimadas/queimadas/focos/csv/mensal/Brasil/"
 RAW_DIR = "data/raw/"
@@ -12,6 +14,7 @@ PROCESSED_DIR = "data/processed/"
 os.makedirs(RAW_DIR, exist_ok=True)
 os.makedirs(PROCESSED_DIR, exist_ok=True)
 
+@traced("data_collection.listar_arquivos")
 def listar_arquivos():
     """Lista todos os arquivos disponíveis no diretório mensal do INPE."""
     print("🔍 Buscando lista de arquivos no INPE...")
@@ -25,6 +28,7 @@ def listar_arquivos():
     print(f"📦 {len(arquivos)} arquivos encontrados.")
     return arquivos
 
+@traced("data_collection.baixar_e_extrair")
 def baixar_e_extrair(arquivo):
     """Baixa e extrai um arquivo .zip do INPE."""
     url = BASE_URL + arquivo
@@ -44,6 +48,7 @@ def baixar_e_extrair(arquivo):
     
     print(f"📂 Extraído em {csv_dir}")
 
+@traced("data_collection.unificar_csvs")
 def unificar_csvs():
     """Lê todos os CSVs extraídos e unifica em um único DataFrame."""
     print("🧩 Unificando todos os CSVs em um só arquivo...")
@@ -70,6 +75,7 @@ def unificar_csvs():
     print(f"📊 Total de registros: {len(df_final)}")
 
 if __name__ == "__main__":
+    enable_from_argv()
     print("🚀 Iniciando coleta de dados de queimadas (INPE)...")
     arquivos = listar_arquivos()
     for arq in arquivos:
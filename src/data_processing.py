@@ -1,11 +1,17 @@
 import os
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from datetime import datetime
 
+from profiling import traced, enable_from_argv
+
 RAW_DIR = "data/raw/"
 PROCESSED_DIR = "data/processed/"
 os.makedirs(PROCESSED_DIR, exist_ok=True)
 
+@traced("data_processing.carregar_todos_csvs")
 def carregar_todos_csvs():
     """Lê todos os CSVs extraídos da pasta data/raw/."""
     print("📂 Lendo arquivos CSV de queimadas...")
@@ -35,6 +41,7 @@ def carregar_todos_csvs():
     print(f"📋 Colunas detectadas: {df.columns.tolist()[:10]}")
     return df
 
+@traced("data_processing.limpar_e_processar")
 def limpar_e_processar(df):
     """Limpa colunas, ajusta tipos e gera colunas de data e mês."""
     print("🧹 Limpando e processando dados...")
@@ -69,25 +76,83 @@ def limpar_e_processar(df):
     return df_agg
 
 
-def criar_target(df):
-    """Cria a coluna 'focos_next' (focos do próximo mês por estado)."""
-    print("🧩 Criando variável alvo (focos_next)...")
-    df['ano_mes'] = pd.to_datetime(df['ano_mes'])
-    df = df.sort_values(['estado', 'ano_mes'])
-
-    df['focos_next'] = df.groupby('estado')['focos'].shift(-1)
-    df = df.dropna(subset=['focos_next'])
-    df['ano_mes'] = df['ano_mes'].dt.to_period('M').astype(str)
-    return df
-
-def salvar_dataset(df):
-    """Salva dataset final em Parquet."""
+@traced("data_processing.criar_target")
+def criar_target(df, horizontes=3, fill_value=0):
+    """
+    Cria os alvos multi-horizonte por estado: focos_next (t+1), focos_next_2 ... focos_next_<horizontes>.
+
+    Cada estado é reindexado numa grade densa de meses (do primeiro ao último mês
+    do dataset), então um mês sem registros vira uma linha explícita com
+    `fill_value` focos (0 = sem focos detectados; np.nan = desconhecido) em vez de
+    ser pulado; assim t+1 é sempre o mês seguinte de calendário.
+    """
+    print(f"🧩 Criando variáveis alvo (focos_next, horizontes 1..{horizontes})...")
+    # dates that failed to parse come as NaN or "NaT" (pandas 2.x to_period): drop before the grid
+    valido = df['ano_mes'].astype(str).str.fullmatch(r'\d{4}-(?:0[1-9]|1[0-2])')
+    if not valido.all():
+        print(f"⚠️ {int((~valido).sum())} linhas com ano_mes inválido descartadas.")
+        df = df[valido]
+    # 'yyyy-mm' -> months since year 0 (integer, vectorized)
+    mes_idx = df['ano_mes'].str[:4].astype(int) * 12 + df['ano_mes'].str[5:7].astype(int) - 1
+    estados = pd.Index(sorted(df['estado'].unique()))
+    meses = pd.RangeIndex(mes_idx.min(), mes_idx.max() + 1)
+
+    # dense (estado x mês) matrix; gaps filled explicitly
+    grid = (pd.Series(df['focos'].to_numpy(dtype=float), index=pd.MultiIndex.from_arrays([df['estado'], mes_idx]))
+            .groupby(level=[0, 1]).sum()
+            .reindex(pd.MultiIndex.from_product([estados, meses]), fill_value=fill_value))
+    focos = grid.to_numpy().reshape(len(estados), len(meses))
+
+    out = pd.DataFrame({
+        'estado': estados.repeat(len(meses)),
+        'ano_mes': np.tile([f"{m // 12}-{m % 12 + 1:02d}" for m in meses], len(estados)),
+        'focos': focos.ravel(),
+    })
+    # t+h targets: shift each state's row of the matrix left by h months (NaN past the end)
+    for h in range(1, horizontes + 1):
+        alvo = np.full_like(focos, np.nan)
+        alvo[:, :-h] = focos[:, h:]
+        out['focos_next' if h == 1 else f'focos_next_{h}'] = alvo.ravel()
+
+    n_gaps = len(out) - len(df)
+    if n_gaps > 0:
+        print(f"🕳️ {n_gaps} meses sem registros preenchidos com {fill_value}.")
+    # last month has no t+1; longer horizons stay NaN at the end of the series
+    return out.dropna(subset=['focos_next']).reset_index(drop=True)
+
+def salvar_dataset(df, row_group_por_estado=True):
+    """
+    Salva dataset final em Parquet compacto: tipos numéricos reduzidos, estado e
+    ano_mes com dictionary encoding, ordenado por (estado, ano_mes) e com um row
+    group por estado (leituras filtradas por estado pulam os demais).
+    """
     out_path = os.path.join(PROCESSED_DIR, "features_state_month.parquet")
-    df.to_parquet(out_path, index=False)
-    print(f"💾 Dataset salvo em: {out_path}")
+    df = df.sort_values(['estado', 'ano_mes']).reset_index(drop=True)
+    df['estado'] = df['estado'].astype('category')
+    if df['focos'].notna().all():
+        df['focos'] = pd.to_numeric(df['focos'].astype('int64'), downcast='integer')
+    for col in df.columns:
+        if col.startswith('focos_next'):
+            df[col] = df[col].astype('float32')
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    # rows per state (sorted) -> one row group per state
+    tamanhos = df['estado'].value_counts(sort=False).reindex(df['estado'].cat.categories).to_numpy()
+    tamanhos = tamanhos[tamanhos > 0] if row_group_por_estado else [len(df)]
+    with pq.ParquetWriter(out_path, table.schema, compression='zstd',
+                          use_dictionary=['estado', 'ano_mes'],
+                          sorting_columns=[pq.SortingColumn(table.schema.get_field_index(c))
+                                           for c in ('estado', 'ano_mes')]) as writer:
+        inicio = 0
+        for n in tamanhos:
+            writer.write_table(table.slice(inicio, n))
+            inicio += n
+    print(f"💾 Dataset salvo em: {out_path} ({len(tamanhos)} row groups, "
+          f"{os.path.getsize(out_path)/1024:.1f} KB)")
     print(df.head())
 
 if __name__ == "__main__":
+    enable_from_argv()
     print("🚀 Iniciando processamento dos dados de queimadas...")
     df_raw = carregar_todos_csvs()
     df_clean = limpar_e_processar(df_raw)
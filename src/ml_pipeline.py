@@ -7,11 +7,15 @@ from sklearn.preprocessing import LabelEncoder
 import joblib
 import numpy as np
 
+from nlp_features import NEWS_FEATURES_PATH, add_news_features
+from profiling import span, enable_from_argv
+
 # Caminhos de entrada e saída
 DATA_PATH = "data/processed/features_state_month.parquet"
 MODEL_DIR = "data/models/"
 OUTPUT_PATH = "data/processed/predictions.csv"
 os.makedirs(MODEL_DIR, exist_ok=True)
+enable_from_argv()
 
 print("🚀 Iniciando treinamento do modelo de previsão de queimadas...")
 
@@ -21,6 +25,12 @@ print("🚀 Iniciando treinamento do modelo de previsão de queimadas...")
 df = pd.read_parquet(DATA_PATH)
 print(f"✅ Dataset carregado: {df.shape[0]} linhas, {df.shape[1]} colunas")
 
+# Sinais de notícias por estado-mês (python src/nlp_features.py), se existirem
+news_cols = []
+if os.path.exists(NEWS_FEATURES_PATH):
+    df, news_cols = add_news_features(df, pd.read_parquet(NEWS_FEATURES_PATH))
+    print(f"📰 {len(news_cols)} sinais de notícias adicionados: {news_cols}")
+
 # ===============================
 # 2️⃣ Pré-processamento
 # ===============================
@@ -41,7 +51,8 @@ df["tempo"] = (df["ano"] - df["ano"].min()) * 12 + df["mes"]
 X = df[["estado_encoded", "ano", "mes", "mes_sin", "mes_cos", "tempo", "focos"]]
 
 # Features e target
-X = df[["estado_encoded", "ano", "mes", "focos"]]
+FEATURES = ["estado_encoded", "ano", "mes", "focos"] + news_cols
+X = df[FEATURES]
 y = df["focos_next"]
 
 # ===============================
@@ -61,13 +72,15 @@ model = RandomForestRegressor(
     random_state=42,
     n_jobs=-1
 )
-model.fit(X_train, y_train)
+with span("ml.fit", rows=len(X_train)):
+    model.fit(X_train, y_train)
 print("🌲 Modelo RandomForest treinado com sucesso!")
 
 # ===============================
 # 5️⃣ Avaliação
 # ===============================
-y_pred = model.predict(X_test)
+with span("ml.predict_test", rows=len(X_test)):
+    y_pred = model.predict(X_test)
 mae = mean_absolute_error(y_test, y_pred)
 rmse = np.sqrt(mean_squared_error(y_test, y_pred))
 r2 = r2_score(y_test, y_pred)
@@ -87,7 +100,8 @@ joblib.dump(model, model_path)
 print(f"💾 Modelo salvo em: {model_path}")
 
 # Gerar previsões completas
-df["predicted_focos_next"] = model.predict(X)
+with span("ml.predict_all", rows=len(X)):
+    df["predicted_focos_next"] = model.predict(X)
 df["erro_absoluto"] = abs(df["predicted_focos_next"] - df["focos_next"])
 
 # Salvar previsões
@@ -129,8 +143,13 @@ df_future["focos"] = df_future.apply(
     axis=1
 )
 
+# sem notícias para meses futuros: sinais zerados
+for col in news_cols:
+    df_future[col] = 0.0
+
 # previsões base
-df_future["predicted_focos_next"] = model.predict(df_future[["estado_encoded","ano","mes","focos"]])
+with span("ml.predict_future", rows=len(df_future)):
+    df_future["predicted_focos_next"] = model.predict(df_future[FEATURES])
 df_future["focos_next"] = np.nan
 df_future["erro_absoluto"] = np.nan
 
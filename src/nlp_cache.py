@@ -0,0 +1,104 @@
+"""
+Cache persistente dos resultados do NLP por texto (usado por nlp_pipeline.run_cached).
+
+Chave: hash do conteúdo do texto. Cada linha guarda a versão do pipeline que a
+gerou e o resultado completo do texto (tema, indicadores, entidades, contagem de
+tokens), em JSON. Um texto só é reprocessado se for novo ou se a versão mudou;
+as saídas agregadas são reconstruídas a partir do cache sem rodar o NLP. Depois de
+cada execução, linhas de outras versões do pipeline são apagadas (prune).
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+
+import pandas as pd
+
+NLP_CACHE_PATH = "data/processed/nlp_cache.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS nlp_cache (
+    hash        TEXT PRIMARY KEY,
+    version     TEXT NOT NULL,
+    theme       TEXT,
+    indicators  TEXT,
+    entities    TEXT,
+    tokens      TEXT
+);
+"""
+
+
+def text_hash(text):
+    return hashlib.sha1(str(text).encode("utf-8")).hexdigest()
+
+
+def hash_series(texts):
+    """text_hash sobre uma Series de textos."""
+    return texts.fillna("").astype(str).map(text_hash)
+
+
+class NLPCache:
+    """Tabela SQLite hash -> resultado do NLP (JSON), em WAL."""
+
+    def __init__(self, path=NLP_CACHE_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as con:
+            con.executescript(SCHEMA)
+
+    def _connect(self):
+        con = sqlite3.connect(self.path, timeout=30)
+        con.execute("PRAGMA journal_mode=WAL")
+        return con
+
+    def stale(self, hashes, version):
+        """
+        Hashes (únicos) ausentes do cache ou gerados por outra versão do pipeline.
+        Só os hashes pedidos são consultados (tabela temporária + join), não o cache inteiro.
+        """
+        uniq = pd.Index(hashes.unique())
+        con = self._connect()
+        try:
+            con.execute("CREATE TEMP TABLE wanted (hash TEXT PRIMARY KEY)")
+            con.executemany("INSERT INTO wanted VALUES (?)", ((h,) for h in uniq))
+            current = {h for (h,) in con.execute(
+                "SELECT w.hash FROM wanted w JOIN nlp_cache c ON c.hash = w.hash WHERE c.version = ?",
+                (version,))}
+        finally:
+            con.close()
+        return uniq[~uniq.isin(current)]
+
+    def prune(self, version):
+        """Apaga as linhas geradas por outras versões do pipeline. Retorna quantas foram apagadas."""
+        con = self._connect()
+        try:
+            with con:
+                deleted = con.execute("DELETE FROM nlp_cache WHERE version != ?", (version,)).rowcount
+        finally:
+            con.close()
+        return deleted
+
+    def put_many(self, hashes, results, version):
+        """Grava/substitui os resultados ({theme, indicators, entities, tokens}) de cada hash."""
+        rows = [(h, version, r["theme"], json.dumps(r["indicators"], ensure_ascii=False),
+                 json.dumps(r["entities"], ensure_ascii=False), json.dumps(r["tokens"], ensure_ascii=False))
+                for h, r in zip(hashes, results)]
+        con = self._connect()
+        try:
+            with con:
+                con.executemany("INSERT OR REPLACE INTO nlp_cache VALUES (?, ?, ?, ?, ?, ?)", rows)
+        finally:
+            con.close()
+
+    def load(self, version):
+        """DataFrame (index hash) com theme, indicators, entities, tokens da versão atual."""
+        con = self._connect()
+        try:
+            df = pd.read_sql("SELECT hash, theme, indicators, entities, tokens FROM nlp_cache WHERE version = ?",
+                             con, params=(version,))
+        finally:
+            con.close()
+        for col in ("indicators", "entities", "tokens"):
+            df[col] = df[col].map(json.loads)
+        return df.set_index("hash")
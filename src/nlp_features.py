@@ -0,0 +1,165 @@
+"""
+Sinais de notícias por (estado, ano_mes) para o modelo.
+
+- Resolve cada texto classificado e cada contexto de indicador para uma UF usando
+  um gazetteer compilado uma vez: nomes/aliases de estados do dashboard
+  (chat_parser.STATE_FULL/ALIAS_MAP) + municípios (data/raw/municipios.csv, opcional);
+  indicador cujo contexto não cita estado fica com a UF do texto de origem (id)
+- Meses no horário de Brasília (datas com fuso convertidas para America/Sao_Paulo)
+- Agrega com groupbys vetorizados: contagem de notícias por tema e soma dos
+  indicadores numéricos (hectares, focos) por (estado, ano_mes)
+- Salva data/processed/nlp_state_month.parquet; ml_pipeline.py junta esse arquivo
+  às features com um merge indexado (add_news_features)
+"""
+
+import os
+import re
+from functools import lru_cache
+
+import pandas as pd
+
+from chat_parser import STATE_FULL, NAME_TO_SIGLA, ALIAS_MAP, ACCENT_REQUIRED, strip_accents
+from theme_matcher import trie_regex, normalize_series
+from profiling import traced, enable_from_argv
+
+PROCESSED_DIR = "data/processed/"
+CLASSIFIED_PATH = os.path.join(PROCESSED_DIR, "texts_classified.csv")
+INDICATORS_PATH = os.path.join(PROCESSED_DIR, "nlp_indicators.csv")
+NEWS_FEATURES_PATH = os.path.join(PROCESSED_DIR, "nlp_state_month.parquet")
+MUNICIPIOS_PATH = "data/raw/municipios.csv"     # optional: columns nome, uf (ex.: lista do IBGE)
+
+LOCAL_TZ = "America/Sao_Paulo"
+# trailing UTC offset / zone name (ISO "-03:00", RFC 822 "-0300", "GMT", "Z")
+TZ_SUFFIX = r"(?:Z|[+-]\d{2}:?\d{2}|\b(?:GMT|UTC|UT|[ECMP][SD]T))\s*$"
+
+# indicator units -> (feature, factor): areas go to hectares
+UNIT_FEATURES = {
+    "ha": ("news_ha", 1.0), "hectares": ("news_ha", 1.0),
+    "km2": ("news_ha", 100.0), "km²": ("news_ha", 100.0),
+    "focos": ("news_focos", 1.0),
+}
+
+
+def state_key(estado):
+    """Chave de join para nomes de estado: 'Pará' / 'PARA' / 'PARÁ' -> 'PARA'."""
+    return strip_accents(estado).upper().strip()
+
+
+def state_key_series(estados):
+    return normalize_series(estados).str.upper().str.strip()
+
+
+@lru_cache(maxsize=None)
+def load_gazetteer(municipios_path=MUNICIPIOS_PATH):
+    """
+    Compila o gazetteer uma vez: (regex de nomes sem acento, {nome: UF}, regex de Pará/siglas).
+    Municípios com nome repetido em mais de uma UF ou muito curto são descartados.
+    """
+    names = {}
+    if os.path.exists(municipios_path):
+        mun = pd.read_csv(municipios_path, encoding="utf-8")
+        mun["key"] = normalize_series(mun["nome"])
+        mun = mun[mun["key"].str.len() >= 4]
+        unique = mun.groupby("key")["uf"].nunique()
+        mun = mun[mun["key"].isin(unique[unique == 1].index)]
+        names.update(zip(mun["key"], mun["uf"].str.upper()))
+    # state names/aliases win over municipalities with the same name
+    for name, sig in list(NAME_TO_SIGLA.items()) + list(ALIAS_MAP.items()):
+        if name not in ACCENT_REQUIRED:
+            names[strip_accents(name)] = sig
+    names_pattern = re.compile(r"\b(" + trie_regex(names) + r")\b")
+    # "para" is a preposition: Pará (and the siglas) only match on the original text, case-sensitive
+    strict = sorted({n.capitalize() for n in ACCENT_REQUIRED} | {n.upper() for n in ACCENT_REQUIRED} | set(STATE_FULL))
+    strict_pattern = re.compile(r"\b(" + "|".join(strict) + r")\b")
+    strict_map = {s: (s if s in STATE_FULL else NAME_TO_SIGLA[s.lower()]) for s in strict}
+    return names_pattern, names, strict_pattern, strict_map
+
+
+def resolve_uf(texts):
+    """UF da primeira menção (nome/município, senão Pará/sigla) em cada texto de uma Series."""
+    names_pattern, names, strict_pattern, strict_map = load_gazetteer()
+    texts = texts.fillna("").astype(str)
+    by_name = normalize_series(texts).str.extract(names_pattern, expand=False).map(names)
+    by_strict = texts.str.extract(strict_pattern, expand=False).map(strict_map)
+    return by_name.fillna(by_strict)
+
+
+def to_ano_mes(dates):
+    """
+    Datas heterogêneas (ISO, RFC 822 do RSS...) -> 'yyyy-mm' no horário de Brasília (NaN se inválida).
+    Datas com fuso são convertidas para America/Sao_Paulo antes de pegar o mês (23h do dia 31 em
+    -03:00 continua no mesmo mês); datas sem fuso já são consideradas locais.
+    """
+    dates = pd.Series(dates).astype("string")
+    aware = dates.str.contains(TZ_SUFFIX, na=False)
+    local = pd.to_datetime(dates.where(aware), errors="coerce", utc=True, format="mixed").dt.tz_convert(LOCAL_TZ)
+    naive = pd.to_datetime(dates.where(~aware), errors="coerce", format="mixed")
+    return local.dt.strftime("%Y-%m").fillna(naive.dt.strftime("%Y-%m"))
+
+
+@traced("nlp_features.build_news_features")
+def build_news_features(classified_path=CLASSIFIED_PATH, indicators_path=INDICATORS_PATH):
+    """DataFrame (estado_key, ano_mes) -> news_total, news_<tema>..., news_ha, news_focos."""
+    parts = []
+    text_uf = pd.Series(dtype=object)
+    if os.path.exists(classified_path):
+        texts = pd.read_csv(classified_path, encoding="utf-8")
+        texts["uf"] = resolve_uf(texts["text"])
+        text_uf = texts.dropna(subset=["uf"]).drop_duplicates("id").set_index("id")["uf"]
+        texts["ano_mes"] = to_ano_mes(texts["date"])
+        texts = texts.dropna(subset=["uf", "ano_mes"])
+        themes = (texts.groupby(["uf", "ano_mes", "theme"]).size()
+                  .unstack(fill_value=0).add_prefix("news_"))
+        themes["news_total"] = themes.sum(axis=1)
+        parts.append(themes)
+        print(f"📰 {len(texts):,} textos com UF e data resolvidas")
+    if os.path.exists(indicators_path):
+        inds = pd.read_csv(indicators_path, encoding="utf-8")
+        unit = inds["unit"].str.lower().map(lambda u: UNIT_FEATURES.get(u, (None, 0.0)))
+        inds["feature"] = unit.str[0]
+        inds["value"] = inds["value"] * unit.str[1]
+        # the context window often misses the state named elsewhere in the text: fall back to the text's UF
+        inds["uf"] = resolve_uf(inds["context"]).fillna(inds["id"].map(text_uf))
+        inds["ano_mes"] = to_ano_mes(inds["date"])
+        inds = inds.dropna(subset=["feature", "uf", "ano_mes"])
+        parts.append(inds.pivot_table(index=["uf", "ano_mes"], columns="feature", values="value",
+                                      aggfunc="sum", fill_value=0.0))
+        print(f"🔢 {len(inds):,} indicadores com UF e data resolvidas")
+    if not parts:
+        return pd.DataFrame()
+    feats = pd.concat(parts, axis=1).fillna(0.0)
+    feats.columns.name = None
+    feats = feats.reset_index()
+    feats.insert(0, "estado_key", feats.pop("uf").map(lambda uf: state_key(STATE_FULL[uf])))
+    return feats
+
+
+def add_news_features(df, news):
+    """
+    Junta os sinais de notícias às features (estado, ano_mes) com um join indexado.
+    Estado/mês sem notícia recebem 0. Retorna (df, lista das colunas news_*).
+    """
+    if news is None or news.empty:
+        return df, []
+    cols = [c for c in news.columns if c.startswith("news_")]
+    news_idx = news.set_index(["estado_key", "ano_mes"])[cols]
+    key = pd.MultiIndex.from_arrays([state_key_series(df["estado"]), df["ano_mes"].astype(str)])
+    joined = news_idx.reindex(key).fillna(0.0)
+    joined.index = df.index
+    return pd.concat([df.drop(columns=cols, errors="ignore"), joined], axis=1), cols
+
+
+def salvar_news_features(feats):
+    feats.to_parquet(NEWS_FEATURES_PATH, index=False)
+    print(f"💾 Sinais de notícias salvos em: {NEWS_FEATURES_PATH} ({len(feats)} linhas estado-mês)")
+
+
+if __name__ == "__main__":
+    enable_from_argv()
+    print("🚀 Agregando sinais de notícias por estado e mês...")
+    feats = build_news_features()
+    if feats.empty:
+        print("❌ Nenhuma saída do NLP encontrada — rode `python src/nlp_pipeline.py` primeiro.")
+    else:
+        salvar_news_features(feats)
+    print("🏁 Sinais de notícias concluídos.")
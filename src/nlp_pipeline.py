@@ -5,6 +5,11 @@ Funcionalidades:
 - Classificação temática (keyword-based) em labels como: desmatamento, denuncia, controle, clima
 - Extração de indicadores numéricos (ha, focos, pessoas) via regex
 - Extração de entidades via spaCy (se o modelo pt_core_news_sm estiver instalado)
+- Processa o corpus em lotes: classificação/keywords vetorizadas em pandas e
+  entidades via nlp.pipe (python src/nlp_pipeline.py --batch-size 512 --n-process 4)
+- Modo streaming para corpora grandes (--chunksize 50000): memória limitada e
+  checkpoint em data/processed/nlp_checkpoint.json para retomar execuções interrompidas
+- Cache por texto (--cache): reprocessa só textos novos ou de versão antiga do pipeline
 - Salva:
     - data/processed/nlp_indicators.csv  (id, date, indicator_type, value, unit, context)
     - data/processed/nlp_keywords.csv    (keyword, count)
@@ -14,13 +19,27 @@ Funcionalidades:
 import os
 import re
 import csv
-import requests
+import json
+import argparse
+import shutil
+import numpy as np
 import pandas as pd
+from itertools import islice
 from collections import Counter, defaultdict
 
+from theme_matcher import ThemeMatcher
+from nlp_cache import NLPCache, hash_series, text_hash
+import profiling
+from profiling import traced
+
 RAW_TEXTS_PATH = "data/raw/texts.csv"            # optional input (id,date,text,source)
 PROCESSED_DIR = "data/processed/"
 os.makedirs(PROCESSED_DIR, exist_ok=True)
+CLASSIFIED_PATH = os.path.join(PROCESSED_DIR, "texts_classified.csv")
+INDICATORS_PATH = os.path.join(PROCESSED_DIR, "nlp_indicators.csv")
+KEYWORDS_PATH = os.path.join(PROCESSED_DIR, "nlp_keywords.csv")
+CHECKPOINT_PATH = os.path.join(PROCESSED_DIR, "nlp_checkpoint.json")   # streaming mode progress
+KEYWORDS_PARTS_DIR = os.path.join(PROCESSED_DIR, "nlp_keywords_parts")  # streaming mode: counts per chunk
 
 # --- helper: try importing spaCy model ---
 use_spacy = False
@@ -44,42 +63,25 @@ def load_texts():
     Returns a dataframe with columns: id, date, text, source
     If data/raw/texts.csv not found, tries to fetch some RSS headlines (best-effort).
     """
-    if os.path.exists(RAW_TEXTS_PATH):
-        print("🔍 Carregando textos existentes em", RAW_TEXTS_PATH)
-        df = pd.read_csv(RAW_TEXTS_PATH, encoding="utf-8", low_memory=False)
-        # ensure columns
-        if 'id' not in df.columns:
-            df = df.reset_index().rename(columns={'index':'id'})
-        if 'text' not in df.columns:
-            raise ValueError("Arquivo texts.csv precisa conter coluna 'text'")
-        return df[['id','date','text','source']] if 'date' in df.columns else df[['id','text']].assign(date="")
-    else:
+    if not os.path.exists(RAW_TEXTS_PATH):
         print("⚠️ data/raw/texts.csv não encontrada — tentando coletar manchetes RSS (melhor usar texts.csv se possível).")
-        # minimal RSS fetch: we'll try G1 busca por 'queimada' (caso internet/ssl funcione). This is best-effort.
-        feeds = [
-            "https://g1.globo.com/rss/g1/amazonia/",
-            "https://g1.globo.com/rss/g1/educacao/",
-            "https://feeds.folha.uol.com.br/emcimadahora/rss.xml"
-        ]
-        texts = []
-        idx = 0
-        for feed in feeds:
-            try:
-                r = requests.get(feed, timeout=10, verify=False)
-                if r.status_code == 200:
-                    # parse simple: extract <title> occurrences
-                    titles = re.findall(r"<title>(.*?)</title>", r.text, flags=re.DOTALL|re.IGNORECASE)
-                    for t in titles[:20]:
-                        txt = re.sub("<.*?>","",t).strip()
-                        if txt and ("queimad" in txt.lower() or "incêndio" in txt.lower() or "fogo" in txt.lower()):
-                            texts.append({"id": idx, "date": "", "text": txt, "source": feed})
-                            idx += 1
-            except Exception as e:
-                print("  ❌ Erro fetching feed", feed, e)
-        if not texts:
+        # concurrent, conditional fetch; new headlines are appended to texts.csv (see rss_collector.py)
+        try:
+            from rss_collector import collect_new_texts
+            collect_new_texts()
+        except Exception as e:
+            print("  ❌ Erro na coleta RSS", e)
+        if not os.path.exists(RAW_TEXTS_PATH):
             print("❌ Não foi possível coletar RSS automaticamente — crie data/raw/texts.csv com textos (id,date,text,source).")
             return pd.DataFrame(columns=['id','date','text','source'])
-        return pd.DataFrame(texts)
+    print("🔍 Carregando textos existentes em", RAW_TEXTS_PATH)
+    df = pd.read_csv(RAW_TEXTS_PATH, encoding="utf-8", low_memory=False)
+    # ensure columns
+    if 'id' not in df.columns:
+        df = df.reset_index().rename(columns={'index':'id'})
+    if 'text' not in df.columns:
+        raise ValueError("Arquivo texts.csv precisa conter coluna 'text'")
+    return df[['id','date','text','source']] if 'date' in df.columns else df[['id','text']].assign(date="")
 
 # --- Step 2: simple thematic classification (keyword-based) ---
 THEME_KEYWORDS = {
@@ -90,18 +92,12 @@ THEME_KEYWORDS = {
     "agronegocio": ["agronegócio", "queima controlada", "limpeza"]
 }
 
+# all keywords compiled once into a single accent-insensitive matcher (see theme_matcher.py)
+THEME_MATCHER = ThemeMatcher(THEME_KEYWORDS)
+
 def classify_text(text):
-    t = text.lower()
-    counts = {}
-    for theme, kws in THEME_KEYWORDS.items():
-        for kw in kws:
-            if kw in t:
-                counts[theme] = counts.get(theme,0) + 1
-    if counts:
-        # choose theme with most hits
-        return max(counts.items(), key=lambda x: x[1])[0]
-    # fallback: neutral
-    return "outros"
+    # theme with most keyword hits; fallback: neutral ("outros")
+    return THEME_MATCHER.classify(text)
 
 # --- Step 3: extract numeric indicators via regex ---
 INDICATOR_PATTERN = re.compile(r'(\d+[.,]?\d*)\s*(ha|hectares|km2|km²|focos|pessoas|casas|m2|m²)', flags=re.IGNORECASE)
@@ -115,7 +111,33 @@ def extract_indicators(text):
         results.append({"indicator":"numeric","value":float(val), "unit":unit, "context":context})
     return results
 
+INDICATOR_COLUMNS = ["id", "date", "indicator_type", "value", "unit", "context", "source"]
+
+def extract_indicators_frame(texts):
+    """
+    extract_indicators over a whole Series in one finditer pass over the texts joined by \\x00
+    (no match can cross it). Returns DataFrame (pos, indicator, value, unit, context), where pos
+    is the row position in `texts`; the context is clipped to the text it came from.
+    """
+    lens = texts.str.len().to_numpy()
+    starts = np.concatenate([[0], np.cumsum(lens + 1)[:-1]]).astype(int)
+    joined = "\x00".join(texts.tolist())
+    found = pd.DataFrame([(m.start(), m.end(), m.group(1), m.group(2)) for m in INDICATOR_PATTERN.finditer(joined)],
+                         columns=["start", "end", "value", "unit"])
+    pos = np.searchsorted(starts, found["start"].to_numpy(), side="right") - 1
+    ctx_from = np.maximum(starts[pos], found["start"].to_numpy() - 40)
+    ctx_to = np.minimum(starts[pos] + lens[pos], found["end"].to_numpy() + 40)
+    return pd.DataFrame({
+        "pos": pos,
+        "indicator": "numeric",
+        "value": pd.to_numeric(found["value"].str.replace(",", ".", regex=False)).astype(float),
+        "unit": found["unit"],
+        "context": [joined[a:b] for a, b in zip(ctx_from, ctx_to)],
+    })
+
 # --- Step 4: extract entities (spaCy NER) or fallback to capitalized-word heuristics ---
+ENTITY_FALLBACK_PATTERN = re.compile(r'\b([A-Z][a-zà-ú]{2,}(?:\s+[A-Z][a-zà-ú]{2,})*)\b')
+
 def extract_entities(text):
     ents = []
     if use_spacy and nlp:
@@ -124,75 +146,335 @@ def extract_entities(text):
             ents.append({"text": e.text, "label": e.label_})
     else:
         # fallback: find capitalized words sequences as possible LOC/ORG
-        matches = re.findall(r'\b([A-Z][a-zà-ú]{2,}(?:\s+[A-Z][a-zà-ú]{2,})*)\b', text)
+        matches = ENTITY_FALLBACK_PATTERN.findall(text)
         for m in matches[:10]:
             ents.append({"text": m, "label": "PROPN"})
     return ents
 
+# only NER is used: everything else in pt_core_news_sm (tagger, parser, lemmatizer...) is skipped
+SPACY_KEEP_PIPES = ("tok2vec", "ner")
+
+def iter_entities(texts, batch_size=256, n_process=1):
+    """
+    Generator with extract_entities' output for each text, streaming all of them through a
+    single nlp.pipe (unused components disabled). Keep one generator per run and consume it
+    batch by batch: each nlp.pipe call with n_process > 1 starts its own worker pool.
+    """
+    if not (use_spacy and nlp):
+        for t in texts:
+            yield extract_entities(t)
+        return
+    disabled = [p for p in nlp.pipe_names if p not in SPACY_KEEP_PIPES]
+    with nlp.select_pipes(disable=disabled):
+        for doc in nlp.pipe(texts, batch_size=batch_size, n_process=n_process):
+            yield [{"text": e.text, "label": e.label_} for e in doc.ents]
+
+def extract_entities_batch(texts, batch_size=256, n_process=1):
+    """Same output as extract_entities, for a list of texts (one nlp.pipe call)."""
+    return list(iter_entities(texts, batch_size=batch_size, n_process=n_process))
+
+# --- Vectorized passes over a batch of texts ---
+TOKEN_PATTERN = r'\b[a-zà-ú]{3,}\b'
+ROWS_PER_PASS = 10000   # rows per vectorized pass in run(); NER streams independently of this
+
+@traced("nlp_pipeline.process_batch")
+def process_batch(df_batch, entities=None, batch_size=256, n_process=1):
+    """
+    Processes a slice of the corpus (columns id, date, text[, source]).
+    `entities`: the slice's entities taken from a shared iter_entities stream; if None,
+    one nlp.pipe call is made for this slice.
+    Returns (classified DataFrame, indicators DataFrame, keywords Counter).
+    """
+    texts = df_batch["text"].fillna("").astype(str)
+    lower = texts.str.lower()
+    sources = df_batch["source"] if "source" in df_batch.columns else pd.Series("", index=df_batch.index)
+
+    df_class = pd.DataFrame({"id": df_batch["id"], "date": df_batch["date"], "text": texts,
+                             "theme": THEME_MATCHER.classify_series(texts)})
+
+    # keywords (simple tokenization)
+    keywords_counter = Counter(lower.str.findall(TOKEN_PATTERN).explode().dropna().tolist())
+
+    inds = extract_indicators_frame(texts)
+    pos = inds["pos"].to_numpy()
+    df_inds = pd.DataFrame({
+        "id": df_batch["id"].to_numpy()[pos],
+        "date": df_batch["date"].to_numpy()[pos],
+        "indicator_type": inds["indicator"],
+        "value": inds["value"],
+        "unit": inds["unit"],
+        "context": inds["context"],
+        "source": sources.to_numpy()[pos],
+    }, columns=INDICATOR_COLUMNS)
+
+    # entities: we save them as keywords as well
+    if entities is None:
+        entities = extract_entities_batch(texts.tolist(), batch_size=batch_size, n_process=n_process)
+    for ents in entities:
+        for e in ents:
+            keywords_counter[e["text"].lower()] += 1
+
+    return df_class, df_inds, keywords_counter
+
+def analyze_texts(texts, batch_size=256, n_process=1):
+    """
+    Per-text results for a Series of texts: [{theme, indicators, entities, tokens}, ...].
+    This is what the result cache stores (see run_cached).
+    """
+    texts = texts.fillna("").astype(str)
+    themes = THEME_MATCHER.classify_series(texts)
+    tokens = texts.str.lower().str.findall(TOKEN_PATTERN)
+    entities = extract_entities_batch(texts.tolist(), batch_size=batch_size, n_process=n_process)
+    indicators = [[] for _ in range(len(texts))]
+    for rec in extract_indicators_frame(texts).to_dict("records"):
+        indicators[rec.pop("pos")].append(rec)
+    return [{"theme": theme, "indicators": inds, "entities": ents, "tokens": dict(Counter(toks))}
+            for theme, inds, toks, ents in zip(themes, indicators, tokens, entities)]
+
+# --- Result cache: only new texts (or texts from an older pipeline version) go through NLP ---
+PIPELINE_VERSION = "1"   # bump when the per-text logic changes in a way the fingerprint below can't see
+
+def cache_version():
+    """PIPELINE_VERSION + fingerprint of keywords, regexes and NER backend: any change invalidates the cache."""
+    spec = json.dumps([PIPELINE_VERSION, THEME_KEYWORDS, INDICATOR_PATTERN.pattern, TOKEN_PATTERN,
+                       nlp.meta.get("name", "") + nlp.meta.get("version", "") if use_spacy and nlp else "fallback"],
+                      ensure_ascii=False, sort_keys=True)
+    return text_hash(spec)[:16]
+
+@traced("nlp_pipeline.run_cached", rows=None)
+def run_cached(batch_size=256, n_process=1, chunk=10000):
+    """
+    Like run(), but per-text results live in a persistent cache keyed by the text hash:
+    only texts missing from the cache (or cached by another pipeline version) are processed,
+    and the three outputs are rebuilt from the cache.
+    """
+    df = load_texts()
+    if df.empty:
+        print("Nada para processar. Saindo.")
+        return
+    if "date" not in df.columns:
+        df["date"] = ""
+    if "source" not in df.columns:
+        df["source"] = ""
+    df["text"] = df["text"].fillna("").astype(str)
+
+    cache = NLPCache()
+    version = cache_version()
+    df["hash"] = hash_series(df["text"])
+    todo = cache.stale(df["hash"], version)
+    print(f"🗃️ Cache: {df['hash'].nunique() - len(todo):,} textos reaproveitados, {len(todo):,} a processar.")
+
+    texts_by_hash = df.drop_duplicates("hash").set_index("hash")["text"]
+    for start in range(0, len(todo), chunk):
+        hashes = todo[start:start+chunk]
+        cache.put_many(hashes, analyze_texts(texts_by_hash.loc[hashes], batch_size, n_process), version)
+    pruned = cache.prune(version)
+    if pruned:
+        print(f"🧹 Cache: {pruned:,} resultados de versões antigas do pipeline removidos.")
+
+    # rebuild outputs from the cache (no NLP work)
+    cached = cache.load(version)
+    merged = df.join(cached, on="hash")
+
+    merged[["id","date","text","theme"]].to_csv(CLASSIFIED_PATH, index=False, encoding="utf-8")
+    print("✅ Texts classified ->", CLASSIFIED_PATH)
+
+    inds = merged[["id","date","source","indicators"]].explode("indicators").dropna(subset=["indicators"])
+    if not inds.empty:
+        fields = pd.DataFrame(inds["indicators"].tolist(), index=inds.index)
+        df_inds = pd.DataFrame({"id": inds["id"], "date": inds["date"], "indicator_type": fields["indicator"],
+                                "value": fields["value"], "unit": fields["unit"], "context": fields["context"],
+                                "source": inds["source"]})
+        df_inds.to_csv(INDICATORS_PATH, index=False, encoding="utf-8")
+        print("✅ Indicators extracted ->", INDICATORS_PATH)
+    else:
+        print("ℹ️ Nenhum indicador numérico extraído.")
+
+    keywords_counter = Counter()
+    for toks, ents in zip(merged["tokens"], merged["entities"]):
+        keywords_counter.update(toks)
+        keywords_counter.update(e["text"].lower() for e in ents)
+    save_keywords(keywords_counter)
+    print("🏁 NLP pipeline concluído.")
+
 # --- Main pipeline ---
-def run():
+@traced("nlp_pipeline.run", rows=None)
+def run(batch_size=256, n_process=1):
     df = load_texts()
     if df.empty:
         print("Nada para processar. Saindo.")
         return
+    if "date" not in df.columns:
+        df["date"] = ""
 
-    indicators_rows = []
+    indicators = []
     keywords_counter = Counter()
-    classified_rows = []
-
-    for idx, row in df.iterrows():
-        _id = row.get('id', idx)
-        text = str(row.get('text',''))
-        date = row.get('date','')
-        theme = classify_text(text)
-        classified_rows.append({"id": _id, "date": date, "text": text, "theme": theme})
-
-        # keywords (simple tokenization)
-        toks = re.findall(r'\b[a-zà-ú]{3,}\b', text.lower())
-        for t in toks:
-            keywords_counter[t] += 1
-
-        # indicators
-        inds = extract_indicators(text)
-        for ind in inds:
-            indicators_rows.append({
-                "id": _id,
-                "date": date,
-                "indicator_type": ind["indicator"],
-                "value": ind["value"],
-                "unit": ind["unit"],
-                "context": ind["context"],
-                "source": row.get("source","")
-            })
-
-        # entities
-        ents = extract_entities(text)
-        # we can save top entities as keywords as well
-        for e in ents:
-            keywords_counter[e["text"].lower()] += 1
+    classified = []
+
+    # one nlp.pipe stream (one worker pool) for the whole corpus, consumed pass by pass
+    entities = iter_entities(df["text"].fillna("").astype(str), batch_size=batch_size, n_process=n_process)
+    for start in range(0, len(df), ROWS_PER_PASS):
+        df_batch = df.iloc[start:start+ROWS_PER_PASS]
+        df_class, df_inds, kws = process_batch(df_batch, entities=list(islice(entities, len(df_batch))))
+        classified.append(df_class)
+        indicators.append(df_inds)
+        keywords_counter.update(kws)
 
     # Save outputs
-    df_class = pd.DataFrame(classified_rows)
-    path_class = os.path.join(PROCESSED_DIR, "texts_classified.csv")
-    df_class.to_csv(path_class, index=False, encoding="utf-8")
-    print("✅ Texts classified ->", path_class)
-
-    if indicators_rows:
-        df_inds = pd.DataFrame(indicators_rows)
-        path_inds = os.path.join(PROCESSED_DIR, "nlp_indicators.csv")
-        df_inds.to_csv(path_inds, index=False, encoding="utf-8")
-        print("✅ Indicators extracted ->", path_inds)
+    df_class = pd.concat(classified, ignore_index=True)
+    df_class.to_csv(CLASSIFIED_PATH, index=False, encoding="utf-8")
+    print("✅ Texts classified ->", CLASSIFIED_PATH)
+
+    df_inds = pd.concat(indicators, ignore_index=True)
+    if not df_inds.empty:
+        df_inds.to_csv(INDICATORS_PATH, index=False, encoding="utf-8")
+        print("✅ Indicators extracted ->", INDICATORS_PATH)
     else:
         print("ℹ️ Nenhum indicador numérico extraído.")
 
-    # Save keywords
+    save_keywords(keywords_counter)
+    print("🏁 NLP pipeline concluído.")
+
+def save_keywords(keywords_counter):
     most = keywords_counter.most_common(200)
     df_kw = pd.DataFrame(most, columns=["keyword","count"])
-    path_kw = os.path.join(PROCESSED_DIR, "nlp_keywords.csv")
-    df_kw.to_csv(path_kw, index=False, encoding="utf-8")
-    print("✅ Keywords saved ->", path_kw)
+    df_kw.to_csv(KEYWORDS_PATH, index=False, encoding="utf-8")
+    print("✅ Keywords saved ->", KEYWORDS_PATH)
+
+# --- Streaming mode: bounded memory + resumable ---
 
+def iter_text_chunks(chunksize, skip=0):
+    """
+    Reads data/raw/texts.csv in chunks of `chunksize` rows, with the same columns as load_texts.
+    The first `skip` rows are skipped by the parser (not parsed and dropped).
+    """
+    offset = skip
+    for chunk in pd.read_csv(RAW_TEXTS_PATH, encoding="utf-8", chunksize=chunksize,
+                             skiprows=range(1, skip + 1)):
+        if 'text' not in chunk.columns:
+            raise ValueError("Arquivo texts.csv precisa conter coluna 'text'")
+        if 'id' not in chunk.columns:
+            chunk.insert(0, 'id', range(offset, offset + len(chunk)))
+        for col in ('date', 'source'):
+            if col not in chunk.columns:
+                chunk[col] = ""
+        offset += len(chunk)
+        yield chunk[['id','date','text','source']]
+
+def _load_checkpoint(chunksize):
+    if not os.path.exists(CHECKPOINT_PATH):
+        return None
+    with open(CHECKPOINT_PATH, encoding="utf-8") as f:
+        ckpt = json.load(f)
+    if ckpt.get("chunksize") != chunksize:
+        print(f"⚠️ Checkpoint com chunksize {ckpt.get('chunksize')} != {chunksize} — recomeçando do zero.")
+        return None
+    if not all(os.path.exists(_keywords_part_path(i)) for i in range(ckpt.get("chunks_done", 0))):
+        print("⚠️ Checkpoint sem as contagens parciais de keywords — recomeçando do zero.")
+        return None
+    return ckpt
+
+def _save_checkpoint(ckpt):
+    # write-then-rename so an interrupted save never leaves a half-written checkpoint
+    tmp = CHECKPOINT_PATH + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(ckpt, f, ensure_ascii=False)
+    os.replace(tmp, CHECKPOINT_PATH)
+
+def _keywords_part_path(i):
+    return os.path.join(KEYWORDS_PARTS_DIR, f"chunk_{i:06d}.csv")
+
+def _save_keywords_part(i, counter):
+    """Keyword counts of chunk i, in the Counter's insertion order (keeps most_common ties stable)."""
+    tmp = _keywords_part_path(i) + ".tmp"
+    pd.DataFrame(list(counter.items()), columns=["keyword", "count"]).to_csv(tmp, index=False, encoding="utf-8")
+    os.replace(tmp, _keywords_part_path(i))
+
+def _merge_keywords_parts(n_chunks):
+    """Sums the per-chunk counts of chunks 0..n_chunks-1, in chunk order."""
+    keywords_counter = Counter()
+    for i in range(n_chunks):
+        part = pd.read_csv(_keywords_part_path(i), encoding="utf-8", dtype={"keyword": str},
+                           keep_default_na=False)
+        keywords_counter.update(dict(zip(part["keyword"], part["count"].astype(int))))
+    return keywords_counter
+
+def _reset_keywords_parts():
+    shutil.rmtree(KEYWORDS_PARTS_DIR, ignore_errors=True)
+    os.makedirs(KEYWORDS_PARTS_DIR, exist_ok=True)
+
+def _truncate(path, size):
+    """Drops anything appended after the last checkpoint (chunk interrupted mid-write)."""
+    if os.path.exists(path) and os.path.getsize(path) > size:
+        with open(path, "r+b") as f:
+            f.truncate(size)
+
+@traced("nlp_pipeline.run_streaming", rows=None)
+def run_streaming(chunksize=10000, batch_size=256, n_process=1, restart=False):
+    """
+    Processes data/raw/texts.csv chunk by chunk: classified texts and indicators are
+    appended to the outputs after each chunk and each chunk's keyword counts go to their
+    own file in nlp_keywords_parts/, merged once at the end, so memory and checkpoint size
+    depend on chunksize, not on the corpus. An interrupted run resumes after the last
+    completed chunk, skipping the rows already processed without parsing them.
+    """
+    if not os.path.exists(RAW_TEXTS_PATH):
+        print("⚠️ Modo streaming precisa de data/raw/texts.csv — usando o modo normal.")
+        return run(batch_size=batch_size, n_process=n_process)
+
+    ckpt = None if restart else _load_checkpoint(chunksize)
+    if ckpt:
+        print(f"⏩ Retomando após {ckpt['chunks_done']} chunks ({ckpt['rows_done']:,} textos).")
+        _truncate(CLASSIFIED_PATH, ckpt["classified_bytes"])
+        _truncate(INDICATORS_PATH, ckpt["indicators_bytes"])
+    else:
+        ckpt = {"chunksize": chunksize, "chunks_done": 0, "rows_done": 0}
+        for path, cols in ((CLASSIFIED_PATH, ["id","date","text","theme"]), (INDICATORS_PATH, INDICATOR_COLUMNS)):
+            pd.DataFrame(columns=cols).to_csv(path, index=False, encoding="utf-8")
+        _reset_keywords_parts()
+
+    chunks = iter_text_chunks(chunksize, skip=ckpt["rows_done"])
+    for i, chunk in enumerate(chunks, start=ckpt["chunks_done"]):
+        df_class, inds, kws = process_batch(chunk, batch_size=batch_size, n_process=n_process)
+        df_class.to_csv(CLASSIFIED_PATH, mode="a", header=False, index=False, encoding="utf-8")
+        if not inds.empty:
+            inds.to_csv(INDICATORS_PATH, mode="a", header=False, index=False, encoding="utf-8")
+        _save_keywords_part(i, kws)
+
+        ckpt.update({
+            "chunks_done": i + 1,
+            "rows_done": ckpt["rows_done"] + len(chunk),
+            "classified_bytes": os.path.getsize(CLASSIFIED_PATH),
+            "indicators_bytes": os.path.getsize(INDICATORS_PATH),
+        })
+        _save_checkpoint(ckpt)
+        print(f"  📦 chunk {i+1}: {ckpt['rows_done']:,} textos processados")
+
+    print("✅ Texts classified ->", CLASSIFIED_PATH)
+    print("✅ Indicators extracted ->", INDICATORS_PATH)
+    save_keywords(_merge_keywords_parts(ckpt["chunks_done"]))
+    os.remove(CHECKPOINT_PATH)
+    shutil.rmtree(KEYWORDS_PARTS_DIR, ignore_errors=True)
     print("🏁 NLP pipeline concluído.")
 
 if __name__ == "__main__":
-    run()
+    ap = argparse.ArgumentParser(description="Pipeline NLP sobre data/raw/texts.csv")
+    ap.add_argument("--batch-size", type=int, default=256, help="textos por lote do nlp.pipe")
+    ap.add_argument("--n-process", type=int, default=1, help="processos do spaCy (nlp.pipe n_process)")
+    ap.add_argument("--chunksize", type=int, default=0,
+                    help="modo streaming: lê texts.csv em chunks de N linhas, com checkpoint/retomada")
+    ap.add_argument("--restart", action="store_true", help="ignora o checkpoint do modo streaming")
+    ap.add_argument("--profile", action="store_true", help="grava tempos/memória em data/processed/profile.jsonl")
+    ap.add_argument("--cache", action="store_true",
+                    help="usa o cache por texto (data/processed/nlp_cache.db): só textos novos passam pelo NLP")
+    args = ap.parse_args()
+    if args.cache and args.chunksize > 0:
+        ap.error("--cache e --chunksize não podem ser usados juntos")
+    profiling.enable_from_argv()
+    if args.cache:
+        run_cached(batch_size=args.batch_size, n_process=args.n_process)
+    elif args.chunksize > 0:
+        run_streaming(chunksize=args.chunksize, batch_size=args.batch_size,
+                      n_process=args.n_process, restart=args.restart)
+    else:
+        run(batch_size=args.batch_size, n_process=args.n_process)
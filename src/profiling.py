@@ -0,0 +1,169 @@
+"""
+Instrumentação leve compartilhada pelos módulos (coleta, processamento, ML, NLP, dashboard).
+
+Desligada por padrão (custo ~zero). Ligada com --profile na linha de comando
+(ou PREDITOR_PROFILE=1), cada span registra tempo de parede, linhas processadas
+e pico de memória (tracemalloc) em data/processed/profile.jsonl, um JSON por linha:
+
+    {"ts": ..., "run": ..., "stage": "data_processing.criar_target",
+     "wall_s": 0.41, "rows": 12345, "peak_mb": 85.2, "mem_mb": 40.1}
+
+Uso:
+    @traced("data_processing.criar_target")
+    def criar_target(df): ...
+
+    with span("ml.fit", rows=len(X_train)):
+        model.fit(X_train, y_train)
+
+Dashboard: `streamlit run src/dashboard.py -- --profile`.
+
+O pico do tracemalloc é global ao processo (reset_peak zera o de todas as threads),
+então só é medido em spans da thread principal: nos scripts em lote o valor é
+confiável; nos spans das threads do Streamlit peak_mb fica null.
+"""
+
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+PROFILE_PATH = "data/processed/profile.jsonl"
+
+_enabled = False
+_path = PROFILE_PATH
+_run_id = None
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def enable(path=PROFILE_PATH):
+    """Liga a instrumentação para este processo."""
+    global _enabled, _path, _run_id
+    if _enabled:
+        return
+    _enabled, _path, _run_id = True, path, uuid.uuid4().hex[:8]
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    print(f"⏱️ Profiling ligado -> {path} (run {_run_id})")
+
+
+def enable_from_argv(argv=None):
+    """Liga se '--profile' estiver nos argumentos ou PREDITOR_PROFILE=1."""
+    argv = sys.argv if argv is None else argv
+    if "--profile" in argv or os.environ.get("PREDITOR_PROFILE") == "1":
+        enable()
+    return _enabled
+
+
+def is_enabled():
+    return _enabled
+
+
+class _Frame:
+    __slots__ = ("start_mem", "peak")
+
+    def __init__(self, start_mem):
+        self.start_mem = start_mem
+        self.peak = start_mem
+
+
+def _stack():
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+def _write(record):
+    line = json.dumps(record, ensure_ascii=False, default=str)
+    with _lock, open(_path, "a", encoding="utf-8") as f:
+        f.write(line + "\n")
+
+
+@contextmanager
+def span(stage, rows=None):
+    """
+    Mede o bloco. `rows` pode ser informado na entrada ou preenchido dentro do
+    bloco via o dict retornado: `with span("x") as s: ...; s["rows"] = len(df)`.
+    """
+    info = {"rows": rows}
+    if not _enabled:
+        yield info
+        return
+    stack = _stack()
+    # the peak counter is process-wide: resetting it from a worker thread would clobber other spans
+    track_peak = threading.current_thread() is threading.main_thread()
+    cur, peak = tracemalloc.get_traced_memory()
+    if track_peak:
+        if stack:
+            # keep the parent's peak so far before resetting the counter for this span
+            stack[-1].peak = max(stack[-1].peak, peak)
+        tracemalloc.reset_peak()
+    frame = _Frame(cur)
+    stack.append(frame)
+    start = time.perf_counter()
+    try:
+        yield info
+    finally:
+        wall = time.perf_counter() - start
+        cur, peak = tracemalloc.get_traced_memory()
+        frame.peak = max(frame.peak, peak)
+        stack.pop()
+        if stack and track_peak:
+            stack[-1].peak = max(stack[-1].peak, frame.peak)
+        _write({
+            "ts": datetime.now().isoformat(timespec="seconds"),
+            "run": _run_id,
+            "stage": stage,
+            "wall_s": round(wall, 4),
+            "rows": info["rows"],
+            "peak_mb": round(frame.peak / 1e6, 2) if track_peak else None,
+            "mem_mb": round(cur / 1e6, 2),
+        })
+
+
+def _count_rows(result):
+    """Linhas do resultado: len() de DataFrame/lista, 1º elemento se for tupla."""
+    if isinstance(result, tuple) and result:
+        result = result[0]
+    try:
+        return len(result)
+    except TypeError:
+        return None
+
+
+def traced(stage, rows=_count_rows):
+    """Decorator: span com o nome `stage`; `rows(resultado)` dá as linhas processadas."""
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with span(stage) as s:
+                result = fn(*args, **kwargs)
+                s["rows"] = rows(result) if rows else None
+            return result
+        return wrapper
+    return deco
+
+
+def read_spans(path=PROFILE_PATH, limit=20000):
+    """Últimos `limit` spans gravados (lista de dicts), para o painel do dashboard."""
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        lines = deque(f, maxlen=limit)
+    records = []
+    for line in lines:
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            continue
+    return records
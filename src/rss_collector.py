@@ -0,0 +1,163 @@
+"""
+Coleta assíncrona de manchetes RSS para data/raw/texts.csv.
+
+- Busca vários feeds ao mesmo tempo (asyncio + aiohttp), com limite de concorrência
+- Requisições condicionais: guarda ETag/Last-Modified de cada feed e envia
+  If-None-Match/If-Modified-Since; feed sem mudança responde 304 e não é reprocessado
+- Conjunto persistente de hashes das manchetes já vistas: só manchetes novas
+  são acrescentadas ao texts.csv (sem duplicatas entre execuções)
+
+Uso:
+    python src/rss_collector.py [--feeds URL ...] [--concurrency 8] [--profile]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import re
+
+import aiohttp
+import feedparser
+import pandas as pd
+
+from chat_parser import strip_accents
+from profiling import traced, enable_from_argv
+
+RAW_TEXTS_PATH = "data/raw/texts.csv"
+RSS_STATE_PATH = "data/raw/rss_state.json"    # feed -> {etag, last_modified}
+RSS_SEEN_PATH = "data/raw/rss_seen.txt"       # one headline hash per line
+
+FEEDS = [
+    "https://g1.globo.com/rss/g1/amazonia/",
+    "https://g1.globo.com/rss/g1/educacao/",
+    "https://feeds.folha.uol.com.br/emcimadahora/rss.xml"
+]
+# only headlines about fire are kept
+TOPIC_PATTERN = re.compile(r"queimad|incendio|fogo")
+
+
+def headline_hash(text):
+    """Hash da manchete normalizada (sem acentos, caixa e espaços extras)."""
+    norm = " ".join(strip_accents(text).split())
+    return hashlib.sha1(norm.encode("utf-8")).hexdigest()
+
+
+def load_state(path=RSS_STATE_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_state(state, path=RSS_STATE_PATH):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, path)
+
+
+def load_seen(path=RSS_SEEN_PATH):
+    if not os.path.exists(path):
+        return set()
+    with open(path, encoding="utf-8") as f:
+        return {line.strip() for line in f if line.strip()}
+
+
+def parse_feed(content, url):
+    """Entradas do feed como dicts (date, text, source), já filtradas pelo tema."""
+    items = []
+    for entry in feedparser.parse(content).entries:
+        txt = re.sub("<.*?>", "", entry.get("title", "")).strip()
+        if txt and TOPIC_PATTERN.search(strip_accents(txt)):
+            items.append({"date": entry.get("published", ""), "text": txt, "source": url})
+    return items
+
+
+async def fetch_feed(session, sem, url, state, timeout=10, verify_ssl=False):
+    """GET condicional de um feed. Retorna a lista de itens ([] se 304 ou erro)."""
+    headers = {}
+    cached = state.get(url, {})
+    if cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if cached.get("last_modified"):
+        headers["If-Modified-Since"] = cached["last_modified"]
+    async with sem:
+        try:
+            async with session.get(url, headers=headers, ssl=None if verify_ssl else False,
+                                   timeout=aiohttp.ClientTimeout(total=timeout)) as r:
+                if r.status == 304:
+                    print(f"  ⏭️  {url}: sem mudanças (304)")
+                    return []
+                if r.status != 200:
+                    print(f"  ❌ {url}: HTTP {r.status}")
+                    return []
+                content = await r.read()
+                state[url] = {"etag": r.headers.get("ETag"), "last_modified": r.headers.get("Last-Modified")}
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"  ❌ Erro fetching feed {url}: {e!r}")
+            return []
+    items = parse_feed(content, url)
+    print(f"  📰 {url}: {len(items)} manchetes sobre o tema")
+    return items
+
+
+async def collect(feeds=FEEDS, concurrency=8, timeout=10, verify_ssl=False, state=None):
+    """Busca todos os feeds concorrentemente; retorna os itens de todos os feeds que mudaram."""
+    state = load_state() if state is None else state
+    sem = asyncio.Semaphore(concurrency)
+    async with aiohttp.ClientSession() as session:
+        results = await asyncio.gather(*(fetch_feed(session, sem, url, state, timeout, verify_ssl) for url in feeds))
+    return [item for items in results for item in items]
+
+
+@traced("rss_collector.collect_new_texts")
+def collect_new_texts(feeds=FEEDS, concurrency=8, timeout=10, verify_ssl=False):
+    """
+    Coleta os feeds e acrescenta ao texts.csv apenas manchetes ainda não vistas.
+    Retorna um DataFrame com as linhas novas (id, date, text, source).
+    """
+    os.makedirs(os.path.dirname(RAW_TEXTS_PATH), exist_ok=True)
+    state = load_state()
+    items = asyncio.run(collect(feeds, concurrency, timeout, verify_ssl, state))
+
+    seen = load_seen()
+    new_rows, new_hashes = [], []
+    for item in items:
+        h = headline_hash(item["text"])
+        if h not in seen:
+            seen.add(h)
+            new_hashes.append(h)
+            new_rows.append(item)
+
+    df_new = pd.DataFrame(new_rows, columns=["date", "text", "source"])
+    if new_rows:
+        exists = os.path.exists(RAW_TEXTS_PATH)
+        columns, next_id = ["id", "date", "text", "source"], 0
+        if exists:
+            # append with the existing file's column order; ids continue after the current max
+            old_ids = pd.read_csv(RAW_TEXTS_PATH, usecols=lambda c: c == "id")
+            columns = pd.read_csv(RAW_TEXTS_PATH, nrows=0).columns.tolist()
+            next_id = int(old_ids["id"].max()) + 1 if "id" in old_ids and len(old_ids) else 0
+        df_new.insert(0, "id", range(next_id, next_id + len(df_new)))
+        df_new = df_new.reindex(columns=columns, fill_value="")
+        df_new.to_csv(RAW_TEXTS_PATH, mode="a", header=not exists, index=False, encoding="utf-8")
+        # hashes only after the rows are on disk: a crash here re-adds, never loses, a headline
+        with open(RSS_SEEN_PATH, "a", encoding="utf-8") as f:
+            f.writelines(h + "\n" for h in new_hashes)
+    save_state(state)
+    print(f"✅ {len(new_rows)} manchetes novas acrescentadas em {RAW_TEXTS_PATH} "
+          f"({len(items) - len(new_rows)} já vistas)")
+    return df_new
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Coleta manchetes RSS novas para data/raw/texts.csv")
+    ap.add_argument("--feeds", nargs="+", default=FEEDS, help="URLs dos feeds RSS")
+    ap.add_argument("--concurrency", type=int, default=8, help="máximo de feeds buscados ao mesmo tempo")
+    ap.add_argument("--timeout", type=int, default=10, help="timeout por feed (s)")
+    ap.add_argument("--profile", action="store_true", help="grava tempos/memória em data/processed/profile.jsonl")
+    args = ap.parse_args()
+    enable_from_argv()
+    collect_new_texts(args.feeds, args.concurrency, args.timeout)
@@ -0,0 +1,104 @@
+"""
+Classificador temático compilado (usado por nlp_pipeline.py).
+
+Todas as palavras-chave de THEME_KEYWORDS viram um único regex em forma de trie
+(ex.: desmat(?:ar|amento)?) sobre o texto sem acentos. Cada posição do texto
+é testada contra o trie uma vez, não contra cada palavra-chave, então o custo
+cresce com o tamanho do texto e quase nada com o número de palavras-chave.
+
+A contagem por tema é o número de palavras-chave distintas do tema presentes no
+texto (mesma regra do antigo loop `kw in t`): um match também conta as
+palavras-chave contidas nele ("desmatar" conta "desmat" e "desmatar"), e matches
+sobrepostos contam todos ("secabra" acha "seca" e "cabra").
+"""
+
+import re
+from collections import Counter, defaultdict
+
+import pandas as pd
+
+from chat_parser import strip_accents
+
+
+def trie_regex(words):
+    """Regex equivalente à alternância das palavras, fatorada por prefixo comum."""
+    trie = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def build(node):
+        alts = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch != ""]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        # optional tail: the greedy branch gives the longest keyword at each position
+        return "(?:" + body + ")?" if "" in node else body
+
+    return build(trie)
+
+
+def normalize_series(texts):
+    """strip_accents vetorizado sobre uma Series de textos."""
+    return (texts.astype("string").fillna("").str.normalize("NFKD")
+            .str.replace("[\u0300-\u036f]", "", regex=True).str.lower())
+
+
+class ThemeMatcher:
+    """Compila {tema: [palavras-chave]} em um único regex e conta hits por tema em uma passada."""
+
+    def __init__(self, theme_keywords, default="outros"):
+        self.themes = list(theme_keywords)
+        self.default = default
+        kw_themes = defaultdict(set)
+        for theme, kws in theme_keywords.items():
+            for kw in kws:
+                kw_n = strip_accents(kw)
+                if kw_n:
+                    kw_themes[kw_n].add(theme)
+        # matched keyword -> every (theme, keyword) it implies, i.e. keywords that are substrings of it
+        self._implied = {}
+        for kw in kw_themes:
+            subs = {kw[i:j] for i in range(len(kw)) for j in range(i + 1, len(kw) + 1)}
+            self._implied[kw] = [(t, s) for s in subs if s in kw_themes for t in kw_themes[s]]
+        # zero-width lookahead: findall tries every start position, so keywords that begin inside
+        # an earlier match ("cabra" in "secabra") are found too; group 1 is the longest one there
+        self.pattern = re.compile("(?=(" + trie_regex(kw_themes) + "))") if kw_themes else None
+
+    def counts(self, text):
+        """{tema: palavras-chave distintas encontradas} para um texto."""
+        if self.pattern is None:
+            return {}
+        hits = set()
+        for m in self.pattern.findall(strip_accents(text)):
+            hits.update(self._implied[m])
+        return dict(Counter(t for t, _ in hits))
+
+    def classify(self, text):
+        counts = self.counts(text)
+        if not counts:
+            return self.default
+        # first theme (in THEME_KEYWORDS order) with most hits
+        return max(self.themes, key=lambda t: counts.get(t, 0))
+
+    def count_frame(self, texts):
+        """Hits por tema para uma Series inteira: DataFrame (index de texts) x temas."""
+        if self.pattern is None or texts.empty:
+            return pd.DataFrame(0, index=texts.index, columns=self.themes)
+        found = normalize_series(texts).str.findall(self.pattern).explode().dropna()
+        pairs = found.map(self._implied).explode().dropna()
+        if pairs.empty:
+            return pd.DataFrame(0, index=texts.index, columns=self.themes)
+        hits = pd.DataFrame(pairs.tolist(), columns=["theme", "keyword"], index=pairs.index)
+        hits = hits.reset_index().drop_duplicates()
+        idx_col = hits.columns[0]
+        return (hits.groupby([idx_col, "theme"]).size().unstack(fill_value=0)
+                .reindex(index=texts.index, columns=self.themes, fill_value=0))
+
+    def classify_series(self, texts):
+        """classify() vetorizado sobre uma Series de textos."""
+        counts = self.count_frame(texts)
+        # idxmax keeps the first theme on ties, like classify()
+        return counts.idxmax(axis=1).where(counts.max(axis=1) > 0, self.default)